@@ -18,10 +18,15 @@ kivy.require('1.9.0')
 # The Label widget is for rendering text.
 from kivy.uix.label import Label
 
-# The Clock object allows you to schedule
-# a function call in the future; once or
-# repeatedly at specified intervals.
-from kivy.clock import Clock
+# LifecycleScheduler uses the Clock to schedule
+# a function call repeatedly at specified
+# intervals, but stops calling it while the
+# app is paused or the window is minimized.
+from lifecycle import LifecycleScheduler
+
+# Counters and timers, only active when the
+# TELEMETRY_FILE environment variable is set.
+import telemetry
  
 # The kivy App that extends from the App class
 class ClockDemo(App):
@@ -31,11 +36,13 @@ class ClockDemo(App):
     def build(self):
        self.myLabel = Label(text ='Waiting for updates...')
 
-       # Start the clock
-       Clock.schedule_interval(self.Callback_Clock, 1)
+       # Start the clock (it stops while the window is not visible)
+       self.clock = LifecycleScheduler()
+       self.clock.schedule_interval(self.Callback_Clock, 1)
        
        return self.myLabel
 
+    @telemetry.timed('clock_demo_callback')
     def Callback_Clock(self, dt):
         self.count = self.count + 1
         self.myLabel.text = "Updated % d...times"% self.count
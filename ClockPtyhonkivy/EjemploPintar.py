@@ -1,52 +1,484 @@
 import kivy   
+# Reglas KV compiladas en caché (antes de que se importe kivy.lang)
+import kv_cache
+kv_cache.install()
 from kivy.app import App  
 from kivy.uix.relativelayout import RelativeLayout
-from kivy.graphics import Line, Color 
+from kivy.graphics import Line, Color, Rectangle, Fbo, InstructionGroup
+from kivy.graphics.context import get_context
+from kivy.properties import NumericProperty, OptionProperty
+from kivy.logger import Logger
+from kivy.clock import Clock
+
+import os
+import time
+import zlib
+
+from stroke_buffer import StrokeBuffer, Stroke
+from stroke_simplify import StreamSimplifier, SimplifyStats, rdp, SKIP, REPLACE
+from drawing_render import stroke_instructions, render_png
+from history import History, AddStroke, EraseStrokes
+from spatial_index import SegmentGrid
+from input_coalescer import MotionCoalescer
+import drawing_file
 
 kivy.require('1.9.0')  
 
+# Clase que funciona como el lienzo de dibujo.
+# Hereda de RelativeLayout para manejar los eventos táctiles
+# y usar su canvas para dibujar.
+class DrawingCanvas(RelativeLayout):
+
+    # Color y grosor de las líneas (verde en este caso)
+    line_color = (0, 1, 0, 1)
+    line_width = 3
+
+    # Tolerancia de la simplificación en píxeles (0 la desactiva) y giro
+    # mínimo en grados para conservar un vértice (ver stroke_simplify.py)
+    simplify_tolerance = NumericProperty(1.0)
+    simplify_angle = NumericProperty(5.0)
+
+    # Herramienta activa: dibujar, goma (borra trazos enteros) o selección
+    tool = OptionProperty('draw', options=['draw', 'erase', 'select'])
+    # Radio de la goma y de la selección en píxeles
+    eraser_radius = NumericProperty(10)
+
+    # Colores de las marcas de la goma y de la selección
+    erase_mark_color = (1, 0, 0, 0.5)
+    selection_color = (0, 0.5, 1, 1)
+
+    def __init__(self, **kwargs):
+        super(DrawingCanvas, self).__init__(**kwargs)
+        self.simplify_stats = SimplifyStats()
+
+        # Trazos terminados. Ya no son instrucciones del canvas: se pintan
+        # una sola vez en la textura de un Fbo y el canvas solo dibuja esa
+        # textura, así el coste por frame no crece con el número de trazos.
+        self.strokes = []
+        self._fbo = Fbo(size=self.size, clear_color=(0, 0, 0, 0))
+        # True si un borrado dejó en la capa trazos que ya no están (ver
+        # _repaint_layer)
+        self._layer_stale = False
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._layer = Rectangle(texture=self._fbo.texture, size=self.size)
+        self.bind(size=self._resize_layer)
+        # El Fbo no conserva los trazos ya pintados (ver _bake): si se
+        # pierde el contexto GL (pausa en Android/iOS, algunos reinicios en
+        # escritorio) la capa vuelve vacía y hay que pintarla otra vez
+        get_context().add_reload_observer(self._on_gl_reload)
+
+        # Carga en curso (ver load_drawing)
+        self._loader = None
+        self._load_event = None
+
+        # Deshacer / rehacer (ver history.py)
+        self.history = History(self._apply_command, self._snapshot, self._restore)
+
+        # Índice de segmentos para la goma y la selección (ver spatial_index.py)
+        self.index = SegmentGrid()
+        self.selected = None
+        self._selection = InstructionGroup()
+        self.canvas.add(self._selection)
+
+        # Los movimientos se procesan en lotes, uno por frame y toque
+        # (ver input_coalescer.py)
+        self.coalescer = MotionCoalescer(self._move_batch)
+
+    def on_touch_down(self, touch):
+        # Comprueba si el toque está dentro de este widget
+        if self.collide_point(*touch.pos) and self.tool == 'erase':
+            # La goma marca los trazos que toca y los borra al soltar
+            touch.ud['erase'] = []
+            touch.ud['marks'] = InstructionGroup()
+            self.canvas.add(touch.ud['marks'])
+            self._erase_at(touch, touch.x, touch.y)
+            return True
+        if self.collide_point(*touch.pos) and self.tool == 'select':
+            self.select_at(touch.x, touch.y)
+            return True
+        if self.collide_point(*touch.pos):
+            # 1. Inicia un nuevo trazo. Los puntos se guardan en un
+            # StrokeBuffer y se dibujan por trozos (ver stroke_buffer.py)
+            stroke = StrokeBuffer()
+            stroke.append(touch.x, touch.y)
+            simplifier = StreamSimplifier(self.simplify_tolerance, self.simplify_angle)
+            simplifier.start(touch.x, touch.y)
+
+            # Cada trazo va en su propio grupo de instrucciones
+            group = InstructionGroup()
+            self.canvas.add(group)
+
+            # 2. Guardamos el trazo en 'touch.ud' para que
+            # on_touch_move pueda referenciarlo.
+            touch.ud['stroke'] = stroke
+            touch.ud['simplifier'] = simplifier
+            touch.ud['group'] = group
+            touch.ud['lines'] = []
+            self._update_lines(touch, 0)
+            self.index.add_points(stroke, stroke.points, self.line_width / 2)
+
+            return True # Indica que el evento fue manejado
+        return super(DrawingCanvas, self).on_touch_down(touch)
+
+    def on_touch_move(self, touch):
+        # Solo si el toque fue iniciado en este widget (tiene el trazo o la
+        # goma guardados). La muestra se guarda y se procesa en _move_batch
+        # junto con las demás que lleguen en este frame.
+        if 'stroke' in touch.ud or 'erase' in touch.ud:
+            self.coalescer.push(touch, touch.x, touch.y)
+            return True
+        return super(DrawingCanvas, self).on_touch_move(touch)
+
+    def _move_batch(self, touch, coords):
+        """Procesa todas las muestras de un toque recibidas en un frame."""
+        if 'erase' in touch.ud:
+            for i in range(0, len(coords), 2):
+                self._erase_at(touch, coords[i], coords[i + 1])
+            return
+
+        stroke = touch.ud['stroke']
+        simplifier = touch.ud['simplifier']
+        index = self.index
+        radius = self.line_width / 2
+        first_chunk = stroke.chunk_count - 1
+        start = time.perf_counter()
+        for i in range(0, len(coords), 2):
+            x = coords[i]
+            y = coords[i + 1]
+            action = simplifier.add(x, y)
+            if action == SKIP:
+                continue
+
+            # 3. Añade el nuevo punto al trazo (o mueve el último si el
+            # trazo sigue recto)
+            if action == REPLACE:
+                stroke.replace_last(x, y)
+            else:
+                stroke.append(x, y)
+
+            # El índice se pone al día con cada punto: si el trazo sigue
+            # recto se alarga su último segmento en vez de añadir otro
+            if action == REPLACE and stroke in index:
+                index.replace_last(stroke, x, y)
+            else:
+                points = stroke.points
+                index.add_segment(stroke, points[-4], points[-3], points[-2], points[-1], radius)
+
+        # Las líneas se actualizan una vez por lote, solo desde el trozo
+        # que estaba abierto
+        self._update_lines(touch, first_chunk)
+        self.simplify_stats.redraw_time += time.perf_counter() - start
+
+    def on_touch_up(self, touch):
+        # Antes de terminar se procesan las muestras pendientes del toque
+        self.coalescer.flush_touch(touch)
+        if 'stroke' in touch.ud:
+            # 4. Al terminar el trazo se le pasa Ramer-Douglas-Peucker, se
+            # pinta en la capa del Fbo y se quitan sus instrucciones en vivo
+            stroke = touch.ud['stroke']
+            points = rdp(stroke.points, self.simplify_tolerance)
+            self.simplify_stats.add_stroke(touch.ud['simplifier'].raw_points,
+                                           len(stroke), len(points) // 2)
+            start = time.perf_counter()
+            self.index.remove(stroke)
+            self.add_stroke(Stroke(points, self.line_color, self.line_width))
+            self.canvas.remove(touch.ud['group'])
+            self.simplify_stats.redraw_time += time.perf_counter() - start
+            Logger.debug('Drawing: %s', self.simplify_stats.summary())
+            Logger.debug('Drawing: %s', self.coalescer.summary())
+            return True
+        if 'erase' in touch.ud:
+            self.canvas.remove(touch.ud['marks'])
+            # Otro dedo con la goma, deshacer o borrar el lienzo pueden haber
+            # quitado ya alguno de los trazos marcados
+            strokes = [stroke for stroke in touch.ud['erase'] if stroke in self.index]
+            if strokes:
+                self.erase_strokes(strokes)
+            return True
+        return super(DrawingCanvas, self).on_touch_up(touch)
+
+    def _erase_at(self, touch, x, y):
+        """Marca los trazos terminados que toca la goma en (x, y)."""
+        erased = touch.ud['erase']
+        for stroke in self.index.query(x, y, self.eraser_radius):
+            # Los trazos en curso (StrokeBuffer) no se pueden borrar
+            if isinstance(stroke, Stroke) and stroke not in erased:
+                erased.append(stroke)
+                mark = Stroke(stroke.points, self.erase_mark_color, stroke.width + 2)
+                touch.ud['marks'].add(stroke_instructions(mark))
+
+    def select_at(self, x, y):
+        """Selecciona el trazo terminado de más arriba en (x, y), o ninguno."""
+        hits = [stroke for stroke in self.index.query(x, y, self.eraser_radius)
+                if isinstance(stroke, Stroke)]
+        if hits:
+            # El más reciente es el que se ve por encima
+            order = {id(stroke): i for i, stroke in enumerate(self.strokes)}
+            self.select(max(hits, key=lambda stroke: order[id(stroke)]))
+        else:
+            self.select(None)
+
+    def select(self, stroke):
+        """Selecciona ``stroke`` (None quita la selección) y dibuja su caja."""
+        self.selected = stroke
+        self._selection.clear()
+        if stroke is not None:
+            xmin, ymin, xmax, ymax = self.index.bbox(stroke)
+            self._selection.add(Color(*self.selection_color))
+            self._selection.add(Line(rectangle=(xmin, ymin, xmax - xmin, ymax - ymin),
+                                     dash_length=4, dash_offset=4))
+
+    def erase_selected(self):
+        if self.selected is not None:
+            self.erase_strokes([self.selected])
+
+    def _resize_layer(self, instance, size):
+        # La textura tiene el tamaño del widget: al cambiarlo se crea un
+        # Fbo nuevo y se vuelven a pintar todos los trazos terminados
+        self._new_layer()
+        self._bake(self.strokes)
+
+    def _on_gl_reload(self, *args):
+        self._new_layer()
+        self._bake(self.strokes)
+
+    def _new_layer(self):
+        """Sustituye la capa por un Fbo vacío del tamaño del widget."""
+        self._layer_stale = False
+        self._fbo = Fbo(size=self.size, clear_color=(0, 0, 0, 0))
+        self._layer.texture = self._fbo.texture
+        self._layer.size = self.size
+
+    def clear_drawing(self):
+        """Borra todos los trazos terminados (y el historial)."""
+        self._stop_loading()
+        self.strokes = []
+        self._new_layer()
+        self.history.clear()
+        self.index.clear()
+        self.select(None)
+
+    def save_drawing(self, path):
+        """Guarda los trazos terminados en formato .kdrw (ver drawing_file.py)."""
+        # Una carga a medias guardaría solo los bloques leídos hasta ahora,
+        # y puede que encima del mismo fichero que se está leyendo
+        self._wait_loading()
+        drawing_file.save(path, self.strokes)
+
+    def load_drawing(self, path):
+        """
+        Sustituye el dibujo por el de ``path``.
+
+        Se decodifica un bloque del fichero por frame y se pinta en cuanto
+        está listo, así los dibujos grandes se ven mientras se cargan. La
+        cabecera se comprueba antes de borrar nada: si no es un dibujo válido
+        se lanza DrawingFileError y el dibujo actual se queda como estaba.
+        """
+        drawing_file.read_header(path)
+        self.clear_drawing()
+        self._loader = drawing_file.iter_blocks(path)
+        self._load_event = Clock.schedule_interval(self._load_block, 0)
+
+    def _load_block(self, dt):
+        try:
+            block = next(self._loader)
+        except StopIteration:
+            self._finish_loading()
+            return False
+        except (drawing_file.DrawingFileError, ValueError, zlib.error) as error:
+            # Un bloque dañado no debe llegar al bucle de eventos: se queda
+            # lo que se haya cargado hasta aquí
+            Logger.error('Drawing: carga interrumpida: %s', error)
+            self._finish_loading()
+            return False
+        self.strokes.extend(block)
+        for stroke in block:
+            self.index.add_points(stroke, stroke.points, stroke.width / 2)
+        self._bake(block)
+
+    def _finish_loading(self):
+        self._stop_loading()
+        # Los trazos cargados no están en el historial: deshacer tiene que
+        # volver a este estado y no al lienzo vacío
+        self.history.checkpoint()
+
+    def _wait_loading(self):
+        """Termina de golpe la carga en curso antes de tocar el historial."""
+        while self._loader is not None:
+            self._load_block(0)
+
+    def _stop_loading(self):
+        if self._load_event is not None:
+            self._load_event.cancel()
+            self._load_event = None
+        if self._loader is not None:
+            self._loader.close()
+            self._loader = None
+
+    def export_png(self, path):
+        """Guarda el dibujo como PNG, a tamaño real y sobre fondo blanco."""
+        self._wait_loading()
+        render_png(self.strokes, self.size, path, fit=False)
+
+    def add_stroke(self, stroke):
+        """Añade un trazo terminado y lo pinta en la capa."""
+        self._wait_loading()
+        self.history.push(AddStroke(stroke))
+        self._repaint_layer()
+
+    def erase_strokes(self, strokes):
+        """Borra trazos terminados (se puede deshacer)."""
+        self._wait_loading()
+        self.history.push(EraseStrokes(strokes))
+        self._repaint_layer()
+
+    def undo(self):
+        self._wait_loading()
+        done = self.history.undo()
+        self._repaint_layer()
+        return done
+
+    def redo(self):
+        self._wait_loading()
+        done = self.history.redo()
+        self._repaint_layer()
+        return done
+
+    def _apply_command(self, command):
+        if isinstance(command, AddStroke):
+            stroke = command.stroke
+            self.strokes.append(stroke)
+            self.index.add_points(stroke, stroke.points, stroke.width / 2)
+            if not self._layer_stale:
+                self._bake([stroke])
+        elif isinstance(command, EraseStrokes):
+            for stroke in command.strokes:
+                # Un trazo que ya no está no se puede borrar otra vez
+                if stroke not in self.index:
+                    continue
+                self.strokes.remove(stroke)
+                self.index.remove(stroke)
+                if stroke is self.selected:
+                    self.select(None)
+            # Borrar de una textura no se puede: hay que volver a pintar la
+            # capa. Se deja para el final, así deshacer pinta una sola vez
+            # aunque repita varios borrados desde el checkpoint.
+            self._layer_stale = True
+
+    def _repaint_layer(self):
+        """Vuelve a pintar la capa entera si algún borrado la dejó desfasada."""
+        if self._layer_stale:
+            self._new_layer()
+            self._bake(self.strokes)
+
+    def _snapshot(self):
+        """Checkpoint del historial: trazos, tamaño y píxeles de la capa."""
+        self._repaint_layer()
+        pixels = self._fbo.pixels
+        return (tuple(self.strokes), tuple(self.size), pixels), len(pixels)
+
+    def _restore(self, state):
+        strokes, size, pixels = state or ((), None, None)
+        # La capa se rehace entera con el estado guardado
+        self._layer_stale = False
+        self._reindex(strokes)
+        self.strokes = list(strokes)
+        if state is None:
+            self._new_layer()
+            return
+        if tuple(self.size) == size:
+            self._fbo.texture.blit_buffer(pixels, colorfmt='rgba', bufferfmt='ubyte')
+        else:
+            # El widget cambió de tamaño desde el checkpoint
+            self._new_layer()
+            self._bake(self.strokes)
+
+    def _reindex(self, strokes):
+        """Actualiza el índice solo con los trazos que cambian respecto a ``strokes``."""
+        new = {id(stroke): stroke for stroke in strokes}
+        old = {id(stroke): stroke for stroke in self.strokes}
+        for key, stroke in old.items():
+            if key not in new:
+                self.index.remove(stroke)
+                if stroke is self.selected:
+                    self.select(None)
+        for key, stroke in new.items():
+            if key not in old:
+                self.index.add_points(stroke, stroke.points, stroke.width / 2)
+
+    def _bake(self, strokes):
+        """Rasteriza ``strokes`` sobre lo que ya tiene el Fbo."""
+        group = InstructionGroup()
+        for stroke in strokes:
+            group.add(stroke_instructions(stroke))
+        self._fbo.add(group)
+        self._fbo.draw()
+        self._fbo.remove(group)
+
+    def _update_lines(self, touch, first):
+        """Actualiza las Line del trazo en curso desde el trozo ``first``, creando las que falten."""
+        stroke = touch.ud['stroke']
+        lines = touch.ud['lines']
+        for i in range(first, stroke.chunk_count):
+            if i < len(lines):
+                lines[i].points = stroke.chunk(i)
+            else:
+                touch.ud['group'].add(Color(*self.line_color))
+                lines.append(Line(points=stroke.chunk(i), width=self.line_width))
+                touch.ud['group'].add(lines[-1])
+
+
 class DrawingApp(App):
     """
     Clase principal de la aplicación que contiene la lógica para 
     crear el lienzo de dibujo y manejar los eventos táctiles.
     """
     
+    # Ficheros de los atajos de teclado
+    drawing_path = 'dibujo.kdrw'
+    png_path = 'dibujo.png'
+    # Teclas de las herramientas
+    tool_keys = {'p': 'draw', 'g': 'erase', 's': 'select'}
+
     def build(self):
-        
-        # Clase interna que funciona como el lienzo de dibujo. 
-        # Hereda de RelativeLayout para manejar los eventos táctiles 
-        # y usar su canvas para dibujar.
-        class DrawingCanvas(RelativeLayout):
-            
-            def on_touch_down(self, touch):
-                # Comprueba si el toque está dentro de este widget
-                if self.collide_point(*touch.pos):
-                    # 1. Inicia un nuevo dibujo en el Canvas
-                    with self.canvas:
-                        # Define el color de la línea (verde en este caso)
-                        Color(0, 1, 0, 1) 
-                        
-                        # 2. Crea un objeto Line. Lo guardamos en 'touch.ud' 
-                        # para que on_touch_move pueda referenciarlo.
-                        touch.ud['line'] = Line(points=(touch.x, touch.y), width=3)
-                        
-                    return True # Indica que el evento fue manejado
-                return super(DrawingCanvas, self).on_touch_down(touch)
-                
-            def on_touch_move(self, touch):
-                # Solo si el toque fue iniciado en este widget (tiene la 'line' guardada)
-                if 'line' in touch.ud:
-                    # 3. Añade el nuevo punto a la línea que se está dibujando
-                    touch.ud['line'].points += [touch.x, touch.y]
-                    return True
-                return super(DrawingCanvas, self).on_touch_move(touch)
-                
-            # No se necesita on_touch_up para este ejemplo simple, 
-            # ya que la línea permanece visible automáticamente.
-        
+        # La ventana se importa aquí para no crearla al importar el módulo
+        from kivy.core.window import Window
+
+        # Atajos: Ctrl+S guarda, Ctrl+O carga, Ctrl+E exporta a PNG,
+        # Ctrl+Z deshace y Ctrl+Y rehace. Sin Ctrl: P lápiz, G goma,
+        # S selección y Supr borra el trazo seleccionado.
+        Window.bind(on_keyboard=self._on_keyboard)
+
         # Retorna la instancia del lienzo de dibujo
         return DrawingCanvas()
 
+    def _on_keyboard(self, window, key, scancode, codepoint, modifiers):
+        if 'ctrl' not in modifiers:
+            if codepoint in self.tool_keys:
+                self.root.tool = self.tool_keys[codepoint]
+            elif key in (8, 127):  # Retroceso / Supr
+                self.root.erase_selected()
+            else:
+                return False
+            return True
+        if codepoint == 's':
+            self.root.save_drawing(self.drawing_path)
+        elif codepoint == 'o' and os.path.exists(self.drawing_path):
+            try:
+                self.root.load_drawing(self.drawing_path)
+            except (drawing_file.DrawingFileError, OSError) as error:
+                Logger.error('Drawing: no se puede cargar %s: %s', self.drawing_path, error)
+        elif codepoint == 'e':
+            self.root.export_png(self.png_path)
+        elif codepoint == 'z':
+            self.root.undo()
+        elif codepoint == 'y':
+            self.root.redo()
+        else:
+            return False
+        return True
+
 if __name__ == '__main__':
     # Mensaje de información personal guardada
     print("Me voy a enfocar solo en lo que está en mi Círculo de Control y voy a ignorar el resto")
@@ -1,3 +1,5 @@
+
+
 # base Class of your App inherits from the App class.
 from kivy.app import App
 # GridLayout arranges children in a matrix.
@@ -6,15 +8,60 @@ from kivy.uix.gridlayout import GridLayout
 from kivy.uix.label import Label
 # used to take input from users
 from kivy.uix.textinput import TextInput
+# Buttons to register and log in
+from kivy.uix.button import Button
+# Clock brings the worker results back to the UI thread
+from kivy.clock import Clock
+from kivy.logger import Logger
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# local SQLite user store and password hashing
+from user_store import UserStore, UserExistsError, hash_password, verify_password
+
+
+# Password hashing is slow on purpose (scrypt / PBKDF2), so it runs on
+# this worker thread and never blocks the Kivy main loop.
+_hasher = ThreadPoolExecutor(max_workers=1)
+
+
+def run_in_background(func, callback, *args, failed=None):
+    """
+    Run func(*args) on the worker thread and call
+    callback(result, seconds) on the Kivy thread when it is done.
+    If func raises, the error is logged and callback gets ``failed``
+    as the result, so the screen never stays busy.
+    """
+    start = time.perf_counter()
+
+    def done(future):
+        elapsed = time.perf_counter() - start
+
+        def deliver(dt):
+            try:
+                result = future.result()
+            except Exception:
+                # re-raising here would stop the Kivy main loop
+                Logger.exception('Login: %s failed', func.__name__)
+                result = failed
+            callback(result, elapsed)
+
+        # Clock.schedule_once is safe to call from another thread
+        Clock.schedule_once(deliver)
+
+    _hasher.submit(func, *args).add_done_callback(done)
 
 
 class LoginScreen(GridLayout):
-    def __init__(self, **var_args):
+    def __init__(self, store, **var_args):
 
         super(LoginScreen, self).__init__(**var_args)
         # super function can be used to gain access
         # to inherited methods from a parent or sibling class
         # that has been overwritten in a class object.
+        self.store = store
         self.cols = 2     # You can change it accordingly
         self.add_widget(Label(text='User Name'))
         self.username = TextInput(multiline=True)
@@ -26,20 +73,87 @@ class LoginScreen(GridLayout):
         self.password = TextInput(password=True, multiline=False)
 
         # password true is used to hide it
-        # by * self.add_widget(self.password)
-        self.add_widget(Label(text='Comfirm password'))
-        self.password = TextInput(password=True, multiline=False)
+        # by *
         self.add_widget(self.password)
+        self.add_widget(Label(text='Comfirm password'))
+        self.confirm_password = TextInput(password=True, multiline=False)
+        self.add_widget(self.confirm_password)
+
+        # Register needs both password fields, Login only the first one
+        self.register_button = Button(text='Register')
+        self.register_button.bind(on_press=self.register)
+        self.add_widget(self.register_button)
+        self.login_button = Button(text='Login')
+        self.login_button.bind(on_press=self.login)
+        self.add_widget(self.login_button)
+
+        self.add_widget(Label(text='Status'))
+        self.status = Label(text='')
+        self.add_widget(self.status)
+
+    def set_busy(self, busy, message=''):
+        """Disable the buttons while a password is being hashed."""
+        self.register_button.disabled = busy
+        self.login_button.disabled = busy
+        self.status.text = message
+
+    def register(self, instance):
+        username = self.username.text.strip()
+        password = self.password.text
+        if not username or not password:
+            self.status.text = 'User name and password are required'
+        elif password != self.confirm_password.text:
+            self.status.text = 'Passwords do not match'
+        elif self.store.exists(username):
+            self.status.text = 'User already exists'
+        else:
+            self.set_busy(True, 'Registering...')
+            run_in_background(hash_password,
+                              lambda record, elapsed: self._registered(username, record, elapsed),
+                              password)
+
+    def _registered(self, username, record, elapsed):
+        if record is None:
+            self.set_busy(False, 'Could not register, try again')
+            return
+        Logger.info('Login: password hashed in %.0f ms off the UI thread', elapsed * 1000)
+        try:
+            self.store.add(username, record)
+        except UserExistsError:
+            self.set_busy(False, 'User already exists')
+        else:
+            self.set_busy(False, f'User {username} registered')
+
+    def login(self, instance):
+        username = self.username.text.strip()
+        record = self.store.record(username)
+        self.set_busy(True, 'Checking...')
+        run_in_background(verify_password,
+                          lambda ok, elapsed: self._logged_in(username, ok, elapsed),
+                          self.password.text, record)
+
+    def _logged_in(self, username, ok, elapsed):
+        if ok is None:
+            self.set_busy(False, 'Could not check the password, try again')
+            return
+        Logger.info('Login: password checked in %.0f ms off the UI thread', elapsed * 1000)
+        if ok:
+            self.set_busy(False, f'Welcome, {username}')
+        else:
+            self.set_busy(False, 'Wrong user name or password')
 
 
 # the Base Class of our Kivy App
 class MyApp(App):
     def build(self):
+        # the user database lives in the per-user data folder of the app
+        self.store = UserStore(os.path.join(self.user_data_dir, 'users.db'))
         # return a LoginScreen() as a root widget
-        return LoginScreen()
+        return LoginScreen(self.store)
+
+    def on_stop(self):
+        self.store.close()
 
 
 if __name__ == '__main__':
     MyApp().run()
-
-
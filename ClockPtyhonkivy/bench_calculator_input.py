@@ -0,0 +1,157 @@
+'''
+Benchmark: latencia de tecla a pantalla en calculator.py.
+
+Compara la entrada de antes, que escribía cada tecla directamente en el
+TextInput (insert_text, como hace un TextInput con foco), con la de ahora:
+las teclas pasan por la ventana a ExpressionBuffer y el display se actualiza
+una vez por frame. La latencia va desde la primera tecla hasta el final del
+frame que ya la muestra, dibujado incluido. Casos:
+
+    tecla a tecla       una tecla por frame
+    ráfaga              --burst teclas por frame (tecleo rápido, autorrepetición)
+    pegado              una expresión de --paste caracteres de golpe
+    tras el pegado      ráfagas de teclas con la expresión larga ya escrita
+
+Uso:
+    python bench_calculator_input.py [--keys 200] [--burst 20] [--paste 5000]
+
+Abre la app en una ventana sin display (SDL offscreen) con el reloj virtual
+de frame_profiler, así que no hace falta pantalla.
+'''
+
+import argparse
+import os
+import statistics
+import time
+
+from frame_profiler import FrameProfiler, headless_environment
+
+for _name, _value in headless_environment().items():
+    os.environ.setdefault(_name, _value)
+
+from launcher import load_app_class
+
+# Teclas que se repiten en los casos de tecleo
+KEYS = '12+34*5-6/7.8'
+
+
+class LegacyInput:
+    """La entrada de antes: cada tecla se escribe al momento en el TextInput."""
+
+    name = 'TextInput'
+
+    def __init__(self, app):
+        self.entry = app.root.display
+
+    def reset(self):
+        # El display ahora es de solo lectura; antes se podía escribir en él
+        self.entry.readonly = False
+        self.entry.text = ''
+
+    def key(self, char):
+        self.entry.insert_text(char)
+
+    def paste(self, text):
+        self.entry.insert_text(text)
+
+    def shown(self):
+        return self.entry.text
+
+
+class BufferInput:
+    """La entrada de ahora: teclas por la ventana y pegado a ExpressionBuffer."""
+
+    name = 'ExpressionBuffer'
+
+    def __init__(self, app):
+        from kivy.core.window import Window
+
+        self.calculator = app.root
+        self.dispatch = Window.dispatch
+
+    def reset(self):
+        self.calculator.display.readonly = True
+        self.calculator.clear()
+
+    def key(self, char):
+        self.dispatch('on_keyboard', ord(char), 0, char, [])
+
+    def paste(self, text):
+        # Lo mismo que hace Ctrl+V con el texto del portapapeles
+        self.calculator.press(text)
+
+    def shown(self):
+        return self.calculator.display.text
+
+
+def latency(profiler, send):
+    """Milisegundos desde ``send()`` hasta el final del frame siguiente."""
+    start = time.perf_counter()
+    send()
+    profiler.frame()
+    return (time.perf_counter() - start) * 1000
+
+
+def run_cases(profiler, source, args):
+    keys = (KEYS * (args.keys // len(KEYS) + 1))[:args.keys]
+    pasted = (KEYS * (args.paste // len(KEYS) + 1))[:args.paste]
+    results = {}
+
+    def burst(chunk):
+        return lambda: [source.key(char) for char in chunk]
+
+    source.reset()
+    profiler.frame()
+    results['tecla a tecla'] = [latency(profiler, burst(char)) for char in keys]
+
+    source.reset()
+    profiler.frame()
+    chunks = [keys[i:i + args.burst] for i in range(0, len(keys), args.burst)]
+    results['ráfaga'] = [latency(profiler, burst(chunk)) for chunk in chunks]
+
+    results['pegado'] = []
+    for _ in range(args.repeat):
+        source.reset()
+        profiler.frame()
+        results['pegado'].append(latency(profiler, lambda: source.paste(pasted)))
+    results['tras el pegado'] = [latency(profiler, burst(chunk)) for chunk in chunks]
+
+    expected = pasted + keys
+    if source.shown() != expected:
+        raise AssertionError(f'{source.name}: el display no muestra lo que se ha tecleado')
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--keys', type=int, default=200, help='teclas por caso')
+    parser.add_argument('--burst', type=int, default=20, help='teclas por frame en las ráfagas')
+    parser.add_argument('--paste', type=int, default=5000, help='caracteres del pegado')
+    parser.add_argument('--repeat', type=int, default=5, help='repeticiones del pegado')
+    args = parser.parse_args()
+
+    app = load_app_class('calculator')()
+    profiler = FrameProfiler()
+    profiler.install()
+    app._run_prepare()
+    for _ in range(10):
+        profiler.frame()
+
+    results = {}
+    for source in (LegacyInput(app), BufferInput(app)):
+        results[source.name] = run_cases(profiler, source, args)
+    app.stop()
+
+    legacy, buffered = results['TextInput'], results['ExpressionBuffer']
+    print(f'Latencia de tecla a pantalla (ms, mediana / máximo); '
+          f'ráfagas de {args.burst} teclas, pegado de {args.paste} caracteres')
+    print(f'{"":>15} {"TextInput":>17} {"ExpressionBuffer":>17}')
+    for case in legacy:
+        cells = [f'{statistics.median(r[case]):7.2f} / {max(r[case]):7.2f}'
+                 for r in (legacy, buffered)]
+        speedup = statistics.median(legacy[case]) / statistics.median(buffered[case])
+        print(f'{case:>15} {cells[0]:>17} {cells[1]:>17}   x{speedup:.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+'''
+Benchmark: tiempo de frame frente a número de trazos en DrawingCanvas.
+
+Compara trazos como instrucciones Color + Line vivas en el canvas (como
+antes) con trazos pintados en la capa del Fbo. Se mide el dibujado completo
+de la ventana (on_draw + on_flip) tras cada tanda de trazos.
+
+Uso:
+    python bench_fbo_bake.py [--strokes 10000] [--step 1000]
+
+Necesita una ventana de Kivy (en máquinas sin pantalla se puede usar
+SDL_VIDEODRIVER=offscreen o xvfb-run).
+'''
+
+import argparse
+import random
+import time
+from array import array
+
+from kivy.base import EventLoop
+EventLoop.ensure_window()
+from kivy.core.window import Window
+
+from stroke_buffer import Stroke
+from EjemploPintar import DrawingCanvas
+from drawing_render import stroke_instructions
+
+# Frames que se promedian en cada punto de medida
+FRAMES = 5
+# Puntos por trazo
+STROKE_POINTS = 20
+
+
+def random_stroke(rng, width, height):
+    """Trazo corto y aleatorio dentro de la ventana."""
+    x = rng.uniform(0, width)
+    y = rng.uniform(0, height)
+    points = array('f')
+    for _ in range(STROKE_POINTS):
+        x += rng.uniform(-10, 10)
+        y += rng.uniform(-10, 10)
+        points.append(x)
+        points.append(y)
+    return Stroke(points, (rng.random(), rng.random(), rng.random(), 1), 3)
+
+
+def frame_time():
+    """Tiempo medio de dibujar la ventana completa."""
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        Window.dispatch('on_draw')
+        Window.dispatch('on_flip')
+    return (time.perf_counter() - start) / FRAMES
+
+
+def run(baked, total, step):
+    """Añade trazos en tandas de ``step`` y mide el frame tras cada una."""
+    rng = random.Random(1)
+    canvas = DrawingCanvas(size=Window.size)
+    Window.add_widget(canvas)
+    results = {}
+    try:
+        for count in range(step, total + 1, step):
+            for _ in range(step):
+                stroke = random_stroke(rng, *Window.size)
+                if baked:
+                    canvas.add_stroke(stroke)
+                else:
+                    canvas.canvas.add(stroke_instructions(stroke))
+            results[count] = frame_time()
+    finally:
+        Window.remove_widget(canvas)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--strokes', type=int, default=10000, help='número total de trazos')
+    parser.add_argument('--step', type=int, default=1000, help='trazos entre puntos de medida')
+    args = parser.parse_args()
+
+    live = run(False, args.strokes, args.step)
+    baked = run(True, args.strokes, args.step)
+
+    print(f'{"trazos":>8} {"en vivo (ms)":>13} {"capa Fbo (ms)":>14}')
+    for count in live:
+        print(f'{count:>8} {live[count] * 1000:>13.2f} {baked[count] * 1000:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+'''
+Benchmark: arranque en frío de kivy.lang con y sin la caché de reglas KV.
+
+Cada medida es un proceso nuevo que importa kivy.lang (lo que carga el
+style.kv de Kivy) y carga calculator.kv y Drawing.kv con Builder.load_file,
+como hacen las apps al arrancar. Se comparan tres casos:
+
+    Builder        sin caché, como hasta ahora
+    caché vacía    primer arranque: compila y además guarda la caché
+    caché          arranques siguientes: lee las reglas de la caché
+
+Uso:
+    python bench_kv_cache.py [--runs 5]
+'''
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+KV_FILES = ('calculator.kv', 'Drawing.kv')
+
+
+def child(use_cache):
+    """Se ejecuta en el proceso hijo: imprime los milisegundos de carga."""
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    import kivy  # noqa: F401  (configuración y logger: no es parte de la medida)
+
+    start = time.perf_counter()
+    if use_cache:
+        import kv_cache
+        kv_cache.install()
+    from kivy.lang import Builder
+    styles = time.perf_counter()
+    for name in KV_FILES:
+        Builder.load_file(os.path.join(HERE, name))
+    end = time.perf_counter()
+    print(f'{(styles - start) * 1000:.3f} {(end - styles) * 1000:.3f}')
+
+
+def measure(use_cache, cache_dir, clear):
+    env = dict(os.environ, KV_CACHE_DIR=cache_dir, KIVY_NO_ARGS='1', KIVY_LOG_LEVEL='error')
+    if clear:
+        for name in os.listdir(cache_dir):
+            os.remove(os.path.join(cache_dir, name))
+    output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child',
+                             'cache' if use_cache else 'plain'],
+                            env=env, cwd=HERE, capture_output=True, text=True, check=True).stdout
+    style_ms, app_ms = (float(v) for v in output.split()[-2:])
+    return style_ms, app_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5, help='procesos por caso')
+    parser.add_argument('--child', choices=('plain', 'cache'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child == 'cache')
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cases = (('Builder', False, False), ('caché vacía', True, True), ('caché', True, False))
+        results = {name: [] for name, _, _ in cases}
+        for _ in range(args.runs):
+            for name, use_cache, clear in cases:
+                results[name].append(measure(use_cache, cache_dir, clear))
+
+    print(f'Mediana de {args.runs} procesos (ms):')
+    print(f'{"":>12} {"style.kv":>10} {"apps .kv":>10} {"total":>10}')
+    baseline = None
+    for name, runs in results.items():
+        style_ms = statistics.median(r[0] for r in runs)
+        app_ms = statistics.median(r[1] for r in runs)
+        total = style_ms + app_ms
+        baseline = baseline or total
+        print(f'{name:>12} {style_ms:10.1f} {app_ms:10.1f} {total:10.1f}'
+              f'   x{baseline / total:.1f}')
+
+
+if __name__ == '__main__':
+    main()
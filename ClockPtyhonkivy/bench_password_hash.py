@@ -0,0 +1,87 @@
+'''
+Benchmark: password hashing cost and its impact on UI frame time.
+
+Measures the KDF used by user_store (scrypt or PBKDF2), then runs a
+simulated 60 FPS main loop while hashing the same password either inline
+on the loop thread (what a naive button handler would do) or on the worker
+thread used by Login.py. Both modes run for the same number of frames and
+report the worst frame interval and how many frames missed their deadline.
+
+Usage:
+    python bench_password_hash.py [--rounds 5]
+'''
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from user_store import default_kdf, hash_password
+
+FRAME = 1 / 60.0
+
+
+def kdf_cost(rounds):
+    """Average seconds per hash_password() call."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        hash_password('correct horse battery staple')
+    return (time.perf_counter() - start) / rounds
+
+
+def frame_loop(rounds, background, frames=0):
+    """
+    Run a 60 FPS loop that starts a hash every few frames until ``rounds``
+    hashes are done and at least ``frames`` frames have passed.
+    Returns (worst frame interval, late frames, frames).
+    """
+    executor = ThreadPoolExecutor(max_workers=1)
+    pending = None
+    started = done = 0
+    intervals = []
+    last = time.perf_counter()
+    deadline = last + FRAME
+    while done < rounds or len(intervals) < frames:
+        # "Button press" every 10 frames if the previous hash finished
+        if pending is None and len(intervals) % 10 == 0 and started < rounds:
+            started += 1
+            if background:
+                pending = executor.submit(hash_password, 'correct horse battery staple')
+            else:
+                hash_password('correct horse battery staple')
+                done += 1
+        if pending is not None and pending.done():
+            pending = None
+            done += 1
+
+        # Wait for the next frame like the Kivy clock does
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        now = time.perf_counter()
+        intervals.append(now - last)
+        last = now
+        deadline = max(deadline + FRAME, now)
+    executor.shutdown()
+    late = sum(1 for interval in intervals if interval > FRAME * 1.5)
+    return max(intervals), late, len(intervals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rounds', type=int, default=5, help='hashes per measurement')
+    args = parser.parse_args()
+
+    print(f'KDF: {default_kdf()}  ({kdf_cost(args.rounds) * 1000:.0f} ms per hash)')
+    # The worker never finishes in fewer frames than inline hashing (it
+    # waits for each hash before the next press), so it runs first and
+    # inline then runs for the same number of frames
+    results = {'worker thread': frame_loop(args.rounds, True)}
+    results['inline'] = frame_loop(args.rounds, False, frames=results['worker thread'][2])
+    for name in ('inline', 'worker thread'):
+        worst, late, frames = results[name]
+        print(f'{name:>14}: worst frame {worst * 1000:6.1f} ms, '
+              f'{late} of {frames} frames late')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+'''
+Benchmark: coste de cada paso del Snake frente a la longitud del Snake.
+
+Para cada variante del lanzador (snake, snake-v2 y snake-keys) se crea su
+SnakeGame con los mismos parámetros que usa la app (game_options()) y se
+compara con una copia de la implementación de antes: el cuerpo en una lista
+(``insert(0, ...)`` y ``[x, y] in snake``) y el canvas vaciado y rehecho
+entero en cada paso.
+
+Los dos juegos empiezan con el mismo cuerpo de N segmentos, la misma
+semilla para la comida y un piloto automático que recorre un ciclo que
+cubre la cuadrícula, así que nunca chocan y deben acabar exactamente igual
+(se comprueba). Se mide:
+
+    paso     actualizar el juego y poner al día el canvas
+    frame    dibujar la ventana (on_draw + on_flip)
+
+Uso:
+    python bench_snake.py [--ticks 100] [--lengths 10 100 300 550 1000]
+
+Abre una ventana sin display (SDL offscreen) si no hay pantalla.
+'''
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from frame_profiler import headless_environment
+
+for _name, _value in headless_environment().items():
+    os.environ.setdefault(_name, _value)
+
+from kivy.base import EventLoop
+EventLoop.ensure_window()
+from kivy.core.window import Window
+from kivy.graphics import Color, Ellipse, Rectangle
+from kivy.uix.widget import Widget
+
+from launcher import load_app_class
+from snake_game import SnakeGame
+from snake_game.engine import DIRECTIONS
+
+VARIANTS = ('snake', 'snake-v2', 'snake-keys')
+SEED = 1
+
+
+class LegacySnake(Widget):
+    """El SnakeGame de antes: lista de segmentos y canvas rehecho en cada paso."""
+
+    def __init__(self, grid, cell_size, rng, **kwargs):
+        super().__init__(**kwargs)
+        self.grid_width, self.grid_height = grid
+        self.cell_size = cell_size
+        self.rng = rng
+
+    def set_body(self, cells, direction):
+        self.snake = [list(cell) for cell in cells]
+        self.direction = self.next_direction = direction
+        self.score = 0
+        self.food_pos = self.generate_food()
+
+    def generate_food(self):
+        while True:
+            x = self.rng.randint(0, self.grid_width - 1)
+            y = self.rng.randint(0, self.grid_height - 1)
+            if [x, y] not in self.snake:
+                return [x, y]
+
+    def turn(self, direction):
+        opposite = {'right': 'left', 'left': 'right', 'up': 'down', 'down': 'up'}
+        if direction != opposite[self.direction]:
+            self.next_direction = direction
+
+    def update(self, dt):
+        self.direction = self.next_direction
+        new_head = list(self.snake[0])
+        dx, dy = DIRECTIONS[self.direction]
+        new_head[0] += dx
+        new_head[1] += dy
+        if new_head in self.snake or not (0 <= new_head[0] < self.grid_width
+                                          and 0 <= new_head[1] < self.grid_height):
+            raise AssertionError('el piloto automático ha chocado')
+        self.snake.insert(0, new_head)
+        if new_head == self.food_pos:
+            self.score += 1
+            self.food_pos = self.generate_food()
+        else:
+            self.snake.pop()
+
+    def draw_elements(self, *args):
+        size = self.cell_size
+        self.canvas.clear()
+        with self.canvas:
+            Color(0.2, 0.2, 0.2, 1)
+            Rectangle(pos=self.pos, size=self.size)
+            Color(0, 0.8, 0, 1)
+            for segment in self.snake:
+                Rectangle(pos=(self.x + segment[0] * size, self.y + segment[1] * size),
+                          size=(size, size))
+            Color(1, 0, 0, 1)
+            Ellipse(pos=(self.x + self.food_pos[0] * size, self.y + self.food_pos[1] * size),
+                    size=(size, size))
+
+    def state(self):
+        return [tuple(cell) for cell in self.snake], tuple(self.food_pos), self.score
+
+
+class NewSnake:
+    """Adaptador del SnakeGame actual con la misma interfaz que LegacySnake."""
+
+    def __init__(self, options, rng):
+        options = dict(options, inputs=(), rng=rng)
+        self.widget = SnakeGame(**options)
+
+    def set_body(self, cells, direction):
+        self.widget.engine.set_body(cells, direction)
+
+    def turn(self, direction):
+        self.widget.turn(direction)
+
+    def update(self, dt):
+        self.widget.update(dt)
+
+    def draw_elements(self):
+        self.widget.draw_elements()
+
+    def state(self):
+        engine = self.widget.engine
+        return list(engine.body), engine.food, engine.score
+
+
+def cycle(width, height):
+    """
+    Ciclo que pasa una vez por cada celda de las columnas 0..w-1 (w par):
+    sube y baja por parejas de columnas y vuelve por la fila 0.
+    """
+    width -= width % 2
+    cells = []
+    for x in range(0, width, 2):
+        cells += [(x, y) for y in range(1, height)]
+        cells += [(x + 1, y) for y in range(height - 1, 0, -1)]
+    cells += [(x, 0) for x in range(width - 1, -1, -1)]
+    return cells
+
+
+def direction_between(a, b):
+    delta = (b[0] - a[0], b[1] - a[1])
+    return next(name for name, d in DIRECTIONS.items() if d == delta)
+
+
+def run(game, widget, path, length, ticks):
+    """Coloca un Snake de ``length`` segmentos sobre ``path`` y lo hace avanzar ``ticks`` pasos."""
+    following = {cell: path[(i + 1) % len(path)] for i, cell in enumerate(path)}
+    body = [path[i] for i in range(length, 0, -1)]
+    game.set_body(body, direction_between(path[length - 1], path[length]))
+    game.draw_elements()
+    Window.add_widget(widget)
+    steps, frames = [], []
+    try:
+        for _ in range(ticks):
+            start = time.perf_counter()
+            head = tuple(game.state()[0][0])
+            game.turn(direction_between(head, following[head]))
+            game.update(0.1)
+            game.draw_elements()
+            middle = time.perf_counter()
+            Window.dispatch('on_draw')
+            Window.dispatch('on_flip')
+            end = time.perf_counter()
+            steps.append(middle - start)
+            frames.append(end - middle)
+    finally:
+        Window.remove_widget(widget)
+    return statistics.median(steps) * 1000, statistics.median(frames) * 1000, game.state()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--ticks', type=int, default=100, help='pasos por medida')
+    parser.add_argument('--lengths', type=int, nargs='+', default=[10, 100, 300, 550, 1000],
+                        help='longitudes del Snake')
+    args = parser.parse_args()
+
+    print(f'Mediana de {args.ticks} pasos (ms)')
+    print(f'{"variante":>10} {"cuadrícula":>10} {"longitud":>8} '
+          f'{"paso antes":>11} {"ahora":>7} {"":>6} {"frame antes":>12} {"ahora":>7}')
+    for name in VARIANTS:
+        app = load_app_class(name)()
+        options = app.game_options()
+        grid, cell_size = options['grid'], options['cell_size']
+        size = (grid[0] * cell_size, grid[1] * cell_size)
+        path = cycle(*grid)
+        for length in args.lengths:
+            # Margen para lo que crezca al comer durante la medida
+            if length + args.ticks >= len(path):
+                continue
+            rngs = random.Random(), random.Random()
+            legacy = LegacySnake(grid, cell_size, rngs[0], size=size)
+            new = NewSnake(app.game_options(), rngs[1])
+            new.widget.size = size
+            # SnakeGame ya ha generado su primera comida: la semilla se pone ahora
+            for rng in rngs:
+                rng.seed(SEED)
+            old_step, old_frame, old_state = run(legacy, legacy, path, length, args.ticks)
+            new_step, new_frame, new_state = run(new, new.widget, path, length, args.ticks)
+            if old_state != new_state:
+                raise AssertionError(f'{name}: las dos implementaciones han divergido')
+            print(f'{name:>10} {grid[0]:>5}x{grid[1]:<4} {length:>8} '
+                  f'{old_step:>11.3f} {new_step:>7.3f} x{old_step / new_step:<5.1f} '
+                  f'{old_frame:>12.3f} {new_frame:>7.3f}')
+
+
+if __name__ == '__main__':
+    main()
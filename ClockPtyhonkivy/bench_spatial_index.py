@@ -0,0 +1,92 @@
+'''
+Benchmark: consultas de la goma con SegmentGrid frente a fuerza bruta.
+
+Genera trazos aleatorios hasta el número de segmentos pedido y compara el
+tiempo por consulta de SegmentGrid.query() con recorrer todos los segmentos,
+comprobando que ambos devuelven los mismos trazos.
+
+Uso:
+    python bench_spatial_index.py [--segments 100000] [--queries 2000]
+'''
+
+import argparse
+import random
+import time
+from array import array
+
+from spatial_index import SegmentGrid, segment_distance2
+
+# Tamaño del lienzo simulado
+WIDTH = 1920
+HEIGHT = 1080
+# Radio de la goma y medio grosor de los trazos
+ERASER_RADIUS = 10
+STROKE_RADIUS = 1.5
+
+
+def random_strokes(rng, segments):
+    """Lista de coordenadas planas de trazos cortos hasta sumar ``segments``."""
+    strokes = []
+    total = 0
+    while total < segments:
+        n = min(rng.randint(5, 60), segments - total + 1)
+        x = rng.uniform(0, WIDTH)
+        y = rng.uniform(0, HEIGHT)
+        points = array('f')
+        for _ in range(n):
+            x += rng.uniform(-6, 6)
+            y += rng.uniform(-6, 6)
+            points.append(x)
+            points.append(y)
+        strokes.append(points)
+        total += n - 1
+    return strokes
+
+
+def brute_force(strokes, x, y, radius):
+    """Recorre todos los segmentos de todos los trazos."""
+    found = set()
+    reach2 = (radius + STROKE_RADIUS) ** 2
+    for key, points in enumerate(strokes):
+        for i in range(0, len(points) - 3, 2):
+            if segment_distance2(x, y, points[i], points[i + 1],
+                                 points[i + 2], points[i + 3]) <= reach2:
+                found.add(key)
+                break
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--segments', type=int, default=100000, help='segmentos indexados')
+    parser.add_argument('--queries', type=int, default=2000, help='consultas con el índice')
+    parser.add_argument('--brute-queries', type=int, default=20, help='consultas por fuerza bruta')
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    strokes = random_strokes(rng, args.segments)
+    queries = [(rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT)) for _ in range(args.queries)]
+
+    grid = SegmentGrid()
+    start = time.perf_counter()
+    for key, points in enumerate(strokes):
+        grid.add_points(key, points, STROKE_RADIUS)
+    build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [grid.query(x, y, ERASER_RADIUS) for x, y in queries]
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    start = time.perf_counter()
+    for (x, y), expected in zip(queries[:args.brute_queries], results):
+        if brute_force(strokes, x, y, ERASER_RADIUS) != expected:
+            raise SystemExit(f'resultado distinto en ({x:.1f}, {y:.1f})')
+    brute = (time.perf_counter() - start) / args.brute_queries
+
+    print(f'{len(strokes)} trazos, {grid.segments} segmentos, índice construido en {build * 1000:.0f} ms')
+    print(f'SegmentGrid:   {indexed * 1000:8.3f} ms por consulta')
+    print(f'fuerza bruta:  {brute * 1000:8.3f} ms por consulta ({brute / indexed:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+'''
+Benchmark: longitud del trazo frente a latencia por evento de movimiento.
+
+Compara la versión original de EjemploPintar (``line.points += [x, y]``)
+con StrokeBuffer. Cada evento incluye el redibujado del canvas en un Fbo,
+que es donde Line vuelve a generar y subir sus vértices. El Fbo es de 1x1
+píxeles para que el coste de rasterizar no tape el de copiar los puntos.
+
+Uso:
+    python bench_stroke_buffer.py [--max 8000] [--step 1000]
+
+Necesita una ventana de Kivy (en máquinas sin pantalla se puede usar
+SDL_VIDEODRIVER=offscreen o xvfb-run).
+'''
+
+import argparse
+import math
+import time
+
+from kivy.base import EventLoop
+EventLoop.ensure_window()
+
+from kivy.graphics import Fbo, Color, Line
+
+from stroke_buffer import StrokeBuffer
+
+# Número de eventos que se promedian en cada punto de medida
+SAMPLE = 50
+
+
+def stroke_point(i):
+    """Genera una espiral para que los puntos no sean triviales."""
+    a = i * 0.01
+    return 400 + math.cos(a) * (50 + i * 0.01), 300 + math.sin(a) * (50 + i * 0.01)
+
+
+def run_naive(fbo, checkpoints):
+    """Un solo Line al que se le concatena cada punto (código original)."""
+    fbo.clear()
+    with fbo:
+        Color(0, 1, 0, 1)
+        line = Line(points=stroke_point(0), width=3)
+    return _run(fbo, checkpoints, lambda x, y: _naive_move(line, x, y))
+
+
+def _naive_move(line, x, y):
+    line.points += [x, y]
+
+
+def run_buffered(fbo, checkpoints):
+    """StrokeBuffer con un Line por trozo."""
+    fbo.clear()
+    stroke = StrokeBuffer()
+    stroke.append(*stroke_point(0))
+    state = {}
+
+    def new_line():
+        fbo.add(Color(0, 1, 0, 1))
+        state['line'] = Line(points=stroke.current_chunk(), width=3)
+        fbo.add(state['line'])
+
+    def move(x, y):
+        if stroke.append(x, y):
+            new_line()
+        else:
+            state['line'].points = stroke.current_chunk()
+
+    new_line()
+    return _run(fbo, checkpoints, move)
+
+
+def _run(fbo, checkpoints, move):
+    """Mide la latencia media por evento (manejo + redibujado) en cada checkpoint."""
+    results = {}
+    i = 1
+    for target in checkpoints:
+        # Llega hasta el checkpoint sin medir
+        while i < target - SAMPLE:
+            move(*stroke_point(i))
+            fbo.draw()
+            i += 1
+        start = time.perf_counter()
+        for _ in range(SAMPLE):
+            move(*stroke_point(i))
+            fbo.draw()
+            i += 1
+        results[target] = (time.perf_counter() - start) / SAMPLE
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--max', type=int, default=8000, help='longitud máxima del trazo (puntos)')
+    parser.add_argument('--step', type=int, default=1000, help='distancia entre puntos de medida')
+    args = parser.parse_args()
+
+    checkpoints = list(range(args.step, args.max + 1, args.step))
+    # Fbo mínimo: solo interesa la generación y subida de vértices
+    fbo = Fbo(size=(1, 1))
+    naive = run_naive(fbo, checkpoints)
+    buffered = run_buffered(fbo, checkpoints)
+
+    print(f'{"puntos":>8} {"original (ms)":>14} {"StrokeBuffer (ms)":>18} {"mejora":>8}')
+    for n in checkpoints:
+        print(f'{n:>8} {naive[n] * 1000:>14.3f} {buffered[n] * 1000:>18.3f} '
+              f'{naive[n] / buffered[n]:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,11 @@
 # Program to Show how to create a switch 
 # import kivy module    
 import kivy  
+
+# reuse the compiled KV rules cached on disk
+# (must run before kivy.lang gets imported)
+import kv_cache
+kv_cache.install()
      
 # base Class of your App inherits from the App class.    
 # app:always refers to the instance of your application   
@@ -25,26 +30,113 @@ Config.set('graphics', 'resizable', 1)
 ## Config.set('graphics', 'width', '400')
 ## Config.set('graphics', 'height', '400')
 
+# the Clock pushes the expression to the
+# display once per frame
+from kivy.clock import Clock
+
+# the expression being typed: tokens and cursor
+from expression_buffer import ExpressionBuffer, tokenize
+
 
 # Creating Layout class
 class CalcGridLayout(GridLayout):
- 
+
+    def __init__(self, **kwargs):
+        super(CalcGridLayout, self).__init__(**kwargs)
+        # Keys edit this buffer, never the TextInput directly
+        self.buffer = ExpressionBuffer()
+        self._shown_version = None
+        self._shown_text = ''
+        # timeout -1: runs once, right before the next frame is drawn,
+        # however many keys arrived since the last one
+        self._push = Clock.create_trigger(self.push_display, -1)
+
+    # Function called when a key is pressed or text is pasted
+    def press(self, text):
+        self.buffer.insert(text)
+        self._push()
+
+    def backspace(self):
+        self.buffer.backspace()
+        self._push()
+
+    def clear(self):
+        self.buffer.clear()
+        self._push()
+
+    def move_cursor(self, offset):
+        self.buffer.move_cursor(offset)
+        self._push()
+
+    def move_cursor_to(self, position):
+        self.buffer.move_cursor_to(position)
+        self._push()
+
     # Function called when equals is pressed
-    def calculate(self, calculation):
-        if calculation:
+    def calculate(self):
+        buffer = self.buffer
+        if buffer.tokens:
             try:
-                # Solve formula and display it in entry
-                # which is pointed at by display
-                self.display.text = str(eval(calculation))
+                # Solve formula; the result is shown in the
+                # entry pointed at by display on the next frame
+                buffer.set_result(str(eval(buffer.text)))
             except Exception:
-                self.display.text = "Error"
- 
+                buffer.set_error("Error")
+            self._push()
+
+    def push_display(self, *args):
+        """Copy the buffer to the display (at most once per frame)."""
+        buffer = self.buffer
+        if self._shown_version == buffer.version:
+            return
+        self._shown_version = buffer.version
+        display = self.display
+        text = buffer.text
+        if text != self._shown_text:
+            self._shown_text = text
+            # Setting the text already leaves the cursor at the end;
+            # moving it again measures the whole line a second time
+            display.text = text
+            if buffer.at_end:
+                return
+        display.cursor = display.get_cursor_from_index(buffer.cursor_index)
+
  # Creating App class
 class CalculatorApp(App):
  
     def build(self):
+        from kivy.core.window import Window
+
+        # Typing goes through the same buffer as the keypad:
+        # digits, operators, Enter or =, Backspace, Delete
+        # clears, arrows/Home/End move and Ctrl+V pastes.
+        Window.bind(on_keyboard=self._on_keyboard)
         return CalcGridLayout()
+
+    def _on_keyboard(self, window, key, scancode, codepoint, modifiers):
+        calculator = self.root
+        if 'ctrl' in modifiers:
+            if codepoint != 'v':
+                return False
+            from kivy.core.clipboard import Clipboard
+            calculator.press(Clipboard.paste())
+        elif key in (13, 271) or codepoint == '=':  # Enter / keypad Enter
+            calculator.calculate()
+        elif key == 8:  # Backspace
+            calculator.backspace()
+        elif key == 127:  # Delete
+            calculator.clear()
+        elif key in (276, 275):  # Left / Right
+            calculator.move_cursor(-1 if key == 276 else 1)
+        elif key in (278, 279):  # Home / End
+            calculator.move_cursor_to(0 if key == 278 else -1)
+        elif codepoint and tokenize(codepoint):
+            calculator.press(codepoint)
+        else:
+            return False
+        return True
  
 # creating object and running it 
-calcApp = CalculatorApp()
-calcApp.run()
+if __name__ == '__main__':
+    calcApp = CalculatorApp()
+    calcApp.run()
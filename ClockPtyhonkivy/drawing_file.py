@@ -0,0 +1,184 @@
+'''
+Formato binario compacto para los dibujos de EjemploPintar (.kdrw).
+
+Estructura (little endian):
+
+    cabecera  '<4sBBHII'  magic b'KDRW', versión, escala, reservado,
+                          número de trazos, número de puntos
+    bloques   '<III'      tamaño comprimido, tamaño sin comprimir, trazos
+              + datos zlib
+
+Dentro de cada bloque, por trazo:
+
+    '<4BHI'   color RGBA (0-255), grosor en centésimas de píxel, puntos
+    int16[]   primer punto absoluto y luego diferencias con el anterior,
+              todo cuantizado a 1/escala píxeles
+
+Los bloques se comprimen por separado, así que se pueden leer uno a uno
+(sobre un mmap del fichero) y mostrar el dibujo antes de decodificarlo entero.
+'''
+
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+from stroke_buffer import Stroke
+
+MAGIC = b'KDRW'
+VERSION = 1
+# Pasos de cuantización por píxel: 2 -> precisión de medio píxel y
+# coordenadas entre -8192 y 8191.5
+SCALE = 2
+# Tamaño aproximado de cada bloque antes de comprimir
+BLOCK_BYTES = 64 * 1024
+
+_HEADER = struct.Struct('<4sBBHII')
+_BLOCK = struct.Struct('<III')
+_STROKE = struct.Struct('<4BHI')
+
+# Límites de la coordenada cuantizada para que las diferencias quepan en int16
+_QMIN = -16384
+_QMAX = 16383
+
+
+class DrawingFileError(ValueError):
+    """El fichero no es un dibujo válido o su versión no está soportada."""
+
+
+def _encode_stroke(stroke, scale):
+    """Cabecera + puntos delta-codificados de un trazo."""
+    rgba = [max(0, min(255, round(c * 255))) for c in stroke.color]
+    n = len(stroke.points) // 2
+    deltas = array('h', bytes(4 * n))
+    for axis in (0, 1):
+        q = [round(v * scale) for v in stroke.points[axis::2]]
+        if q and (min(q) < _QMIN or max(q) > _QMAX):
+            q = [min(max(v, _QMIN), _QMAX) for v in q]
+        deltas[axis::2] = array('h', [b - a for a, b in zip([0] + q, q)])
+    if sys.byteorder == 'big':
+        deltas.byteswap()
+    width = max(0, min(0xFFFF, round(stroke.width * 100)))
+    return _STROKE.pack(*rgba, width, n) + deltas.tobytes()
+
+
+def _decode_block(data, count, scale):
+    """Lista de trazos de un bloque ya descomprimido."""
+    strokes = []
+    offset = 0
+    for _ in range(count):
+        r, g, b, a, width, n = _STROKE.unpack_from(data, offset)
+        offset += _STROKE.size
+        deltas = array('h')
+        deltas.frombytes(data[offset:offset + 4 * n])
+        offset += 4 * n
+        if sys.byteorder == 'big':
+            deltas.byteswap()
+
+        points = array('f', bytes(8 * n))
+        points[0::2] = array('f', [q / scale for q in accumulate(deltas[0::2])])
+        points[1::2] = array('f', [q / scale for q in accumulate(deltas[1::2])])
+        strokes.append(Stroke(points, (r / 255, g / 255, b / 255, a / 255), width / 100))
+    return strokes
+
+
+def save(path, strokes, scale=SCALE):
+    """
+    Guarda una lista de Stroke en ``path``.
+
+    Se escribe en un temporal que luego se renombra: si algo falla a medias
+    el fichero anterior queda intacto.
+    """
+    total_points = sum(len(stroke.points) // 2 for stroke in strokes)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, scale, 0, len(strokes), total_points))
+            block = []
+            size = 0
+            for stroke in strokes:
+                data = _encode_stroke(stroke, scale)
+                block.append(data)
+                size += len(data)
+                if size >= BLOCK_BYTES:
+                    _write_block(f, block, size)
+                    block = []
+                    size = 0
+            if block:
+                _write_block(f, block, size)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _write_block(f, block, size):
+    data = zlib.compress(b''.join(block))
+    f.write(_BLOCK.pack(len(data), size, len(block)))
+    f.write(data)
+
+
+def read_header(path):
+    """Devuelve (trazos, puntos) de un fichero sin decodificar los bloques."""
+    with open(path, 'rb') as f:
+        _, _, _, strokes, points = _unpack_header(f.read(_HEADER.size))
+    return strokes, points
+
+
+def _unpack_header(data):
+    if len(data) < _HEADER.size:
+        raise DrawingFileError('fichero demasiado corto')
+    magic, version, scale, _, strokes, points = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise DrawingFileError('no es un dibujo .kdrw')
+    if version != VERSION:
+        raise DrawingFileError(f'versión {version} no soportada')
+    return magic, version, scale, strokes, points
+
+
+def iter_blocks(path):
+    """
+    Genera los trazos bloque a bloque (una lista por bloque).
+
+    El fichero se mapea en memoria y cada bloque se descomprime solo cuando
+    se pide, de modo que quien consume el generador puede ir pintando. Un
+    bloque truncado o corrupto lanza DrawingFileError al llegar a él.
+    """
+    with open(path, 'rb') as f:
+        # mmap no admite ficheros vacíos
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise DrawingFileError('fichero demasiado corto')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            _, _, scale, _, _ = _unpack_header(data)
+            offset = _HEADER.size
+            while offset < len(data):
+                if offset + _BLOCK.size > len(data):
+                    raise DrawingFileError('bloque truncado')
+                packed, raw, count = _BLOCK.unpack_from(data, offset)
+                offset += _BLOCK.size
+                try:
+                    block = zlib.decompress(data[offset:offset + packed])
+                except zlib.error as error:
+                    raise DrawingFileError(f'bloque corrupto: {error}') from error
+                offset += packed
+                if len(block) != raw:
+                    raise DrawingFileError('bloque corrupto')
+                try:
+                    strokes = _decode_block(block, count, scale)
+                except struct.error as error:
+                    raise DrawingFileError(f'bloque corrupto: {error}') from error
+                yield strokes
+
+
+def load(path):
+    """Carga todos los trazos de ``path``."""
+    strokes = []
+    for block in iter_blocks(path):
+        strokes.extend(block)
+    return strokes
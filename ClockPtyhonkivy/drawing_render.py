@@ -0,0 +1,104 @@
+'''
+Rasterizado de trazos de EjemploPintar y exportación a PNG.
+
+render_png() pinta una lista de trazos en un Fbo fuera de pantalla y guarda
+su textura, sin necesidad de un DrawingCanvas. Desde la línea de comandos
+genera miniaturas de ficheros .kdrw por lotes:
+
+    python drawing_render.py --size 256x256 dibujo1.kdrw dibujo2.kdrw
+
+Kivy necesita un contexto OpenGL; en máquinas sin pantalla se puede usar
+SDL_VIDEODRIVER=offscreen o xvfb-run.
+'''
+
+import argparse
+import os
+
+from kivy.graphics import Fbo, Color, Line, InstructionGroup, PushMatrix, PopMatrix, Scale, Translate
+
+from stroke_buffer import iter_chunks
+
+# Fondo de las miniaturas (el mismo blanco que Drawing.kv)
+BACKGROUND = (1, 1, 1, 1)
+# Margen alrededor del dibujo en las miniaturas, en píxeles
+MARGIN = 4
+
+
+def stroke_instructions(stroke):
+    """Instrucciones Color + Line (por trozos) de un trazo terminado."""
+    group = InstructionGroup()
+    group.add(Color(*stroke.color))
+    for chunk in iter_chunks(stroke.points):
+        group.add(Line(points=chunk, width=stroke.width))
+    return group
+
+
+def bounding_box(strokes):
+    """(xmin, ymin, xmax, ymax) de todos los trazos, o None si no hay puntos."""
+    box = None
+    for stroke in strokes:
+        if not stroke.points:
+            continue
+        xs = stroke.points[0::2]
+        ys = stroke.points[1::2]
+        half = stroke.width / 2
+        b = (min(xs) - half, min(ys) - half, max(xs) + half, max(ys) + half)
+        if box is None:
+            box = b
+        else:
+            box = (min(box[0], b[0]), min(box[1], b[1]), max(box[2], b[2]), max(box[3], b[3]))
+    return box
+
+
+def render_png(strokes, size, filename, fit=True, background=BACKGROUND):
+    """
+    Pinta ``strokes`` en un Fbo de ``size`` píxeles y lo guarda como PNG.
+
+    Con ``fit`` el dibujo se escala (manteniendo proporciones) para ocupar
+    la imagen; si no, se usan las coordenadas originales.
+    """
+    fbo = Fbo(size=size, clear_color=background)
+    with fbo:
+        PushMatrix()
+        box = bounding_box(strokes) if fit else None
+        if box is not None:
+            width = max(box[2] - box[0], 1)
+            height = max(box[3] - box[1], 1)
+            factor = min((size[0] - 2 * MARGIN) / width, (size[1] - 2 * MARGIN) / height)
+            # Centra el dibujo escalado
+            Translate((size[0] - width * factor) / 2, (size[1] - height * factor) / 2)
+            Scale(factor, factor, 1)
+            Translate(-box[0], -box[1])
+    for stroke in strokes:
+        fbo.add(stroke_instructions(stroke))
+    fbo.add(PopMatrix())
+
+    fbo.bind()
+    fbo.clear_buffer()
+    fbo.release()
+    fbo.draw()
+    fbo.texture.save(filename)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Genera miniaturas PNG de dibujos .kdrw')
+    parser.add_argument('files', nargs='+', help='ficheros .kdrw')
+    parser.add_argument('--size', default='256x256', help='tamaño de la miniatura (ANCHOxALTO)')
+    parser.add_argument('--out', help='carpeta de salida (por defecto, junto a cada fichero)')
+    args = parser.parse_args()
+    size = tuple(int(v) for v in args.size.lower().split('x'))
+
+    # Kivy necesita una ventana (aunque no se muestre) para tener contexto GL
+    from kivy.base import EventLoop
+    EventLoop.ensure_window()
+
+    import drawing_file
+    for path in args.files:
+        name = os.path.splitext(os.path.basename(path))[0] + '.png'
+        out = os.path.join(args.out or os.path.dirname(path), name)
+        render_png(drawing_file.load(path), size, out)
+        print(out)
+
+
+if __name__ == '__main__':
+    main()
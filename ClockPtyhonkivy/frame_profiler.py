@@ -0,0 +1,557 @@
+'''
+Perfilador de frames sin pantalla y generador de entrada sintética.
+
+Arranca cada demo del lanzador en su propio proceso, con una ventana SDL
+fuera de pantalla si no hay display, y le da una entrada guionizada: gestos
+(swipes) para snake, teclas para snake-keys y snake-v2, trazos para paint, botones para
+la calculadora... De cada frame se apunta el tiempo de EventLoop.idle() y el
+número de instrucciones del canvas de la ventana, y de cada callback del
+Clock cuántas veces se llamó y cuánto tardó. Al final del guion se minimiza
+la ventana y se mide lo que la app sigue gastando en reposo: callbacks y
+redibujados por segundo.
+
+El reloj es virtual: cada frame avanza 1/60 s y no se duerme entre frames,
+así el mismo guion produce los mismos frames en cualquier máquina y la
+ejecución va tan rápido como se pueda dibujar.
+
+    python frame_profiler.py                          # todas las demos
+    python frame_profiler.py snake paint --json informe.json
+    python frame_profiler.py --json nuevo.json --compare base.json
+
+Con --compare se comparan los tiempos y las instrucciones con un informe
+anterior y el proceso termina con código 1 si algo empeora más que
+--threshold, para usarlo en integración continua.
+'''
+
+import argparse
+from importlib import metadata
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from launcher import load_app_class
+
+# Paso del reloj virtual
+FRAME_DT = 1 / 60.0
+# Presupuesto de un frame a 60 FPS
+FRAME_BUDGET = 1 / 60.0
+# Frames de espera tras arrancar la app y antes de cerrarla
+SETTLE_FRAMES = 30
+# Frames con la ventana minimizada para medir el gasto en reposo
+IDLE_FRAMES = 300
+# Diferencia mínima (ms) para considerar que un tiempo ha empeorado
+MIN_REGRESSION_MS = 1.0
+
+
+def headless_environment():
+    """Variables de entorno para abrir la ventana sin display."""
+    env = {'KIVY_NO_ARGS': '1', 'KIVY_LOG_LEVEL': 'warning'}
+    if not (os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')):
+        env.update(SDL_VIDEODRIVER='offscreen', KIVY_WINDOW='sdl2', KIVY_GL_BACKEND='sdl2')
+    return env
+
+
+def percentile(values, fraction):
+    """Percentil de una lista ya ordenada (vecino más cercano)."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def count_instructions(canvas):
+    """Instrucciones de un canvas, contando las de todos los grupos que contiene."""
+    from kivy.graphics import Canvas, InstructionGroup
+
+    total = 0
+    stack = [canvas]
+    while stack:
+        group = stack.pop()
+        if isinstance(group, Canvas):
+            # before/after se crean al leerlos: solo se miran si ya existen
+            if group.has_before:
+                stack.append(group.before)
+            if group.has_after:
+                stack.append(group.after)
+        for instruction in group.children:
+            total += 1
+            if isinstance(instruction, InstructionGroup):
+                stack.append(instruction)
+    return total
+
+
+class _TimedCallback:
+    """
+    Envuelve un callback del Clock para medir cada llamada.
+
+    Se compara igual que el callback original, así Clock.unschedule(callback)
+    sigue encontrando el evento.
+    """
+
+    def __init__(self, callback, stats):
+        self.callback = callback
+        self.name = getattr(callback, '__qualname__', repr(callback))
+        self._stats = stats
+
+    def __call__(self, *args):
+        start = time.perf_counter()
+        try:
+            return self.callback(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self._stats.get(self.name)
+            if entry is None:
+                entry = self._stats[self.name] = [0, 0.0, 0.0]
+            entry[0] += 1
+            entry[1] += elapsed
+            if elapsed > entry[2]:
+                entry[2] = elapsed
+
+    def __eq__(self, other):
+        if isinstance(other, _TimedCallback):
+            other = other.callback
+        return self.callback == other
+
+    def __hash__(self):
+        return hash(self.callback)
+
+
+class FrameProfiler:
+    """
+    Controla el bucle de eventos frame a frame y guarda las medidas.
+
+    Hay que instalarlo antes de construir la app para que los callbacks que
+    programe la app también se midan.
+    """
+
+    def __init__(self):
+        self.frame_times = []
+        self.instructions = []
+        # nombre del callback -> [llamadas, segundos en total, máximo]
+        self.callbacks = {}
+        self.now = 0.0
+        self._window = None
+
+    def install(self):
+        from kivy.base import EventLoop
+        from kivy.clock import Clock
+
+        # Reloj virtual: sin esperas entre frames y 1/60 s por frame
+        self.now = Clock.get_time()
+        Clock.time = lambda: self.now
+        Clock._max_fps = 0
+
+        for method in ('schedule_once', 'schedule_interval', 'create_trigger'):
+            setattr(Clock, method, self._timed_scheduler(getattr(Clock, method)))
+
+        EventLoop.ensure_window()
+        self._window = EventLoop.window
+
+    def _timed_scheduler(self, schedule):
+        stats = self.callbacks
+
+        def timed_schedule(callback, *args, **kwargs):
+            return schedule(_TimedCallback(callback, stats), *args, **kwargs)
+
+        return timed_schedule
+
+    def frame(self):
+        """Avanza un frame: reloj, entrada, callbacks y dibujado."""
+        from kivy.base import EventLoop
+
+        self.now += FRAME_DT
+        start = time.perf_counter()
+        EventLoop.idle()
+        self.frame_times.append(time.perf_counter() - start)
+        self.instructions.append(count_instructions(self._window.canvas))
+
+    def measure_idle(self, frames=IDLE_FRAMES):
+        """
+        Minimiza la ventana durante ``frames`` frames y mide lo que la app
+        sigue gastando: callbacks del Clock, redibujados y tiempo de bucle
+        por segundo. Estos frames no cuentan en las estadísticas de frame.
+        """
+        from kivy.base import EventLoop
+
+        window = self._window
+        draws = [0]
+
+        def count_draw(*args):
+            draws[0] += 1
+
+        calls = sum(entry[0] for entry in self.callbacks.values())
+        window.dispatch('on_minimize')
+        window.bind(on_flip=count_draw)
+        busy = 0.0
+        for _ in range(frames):
+            self.now += FRAME_DT
+            start = time.perf_counter()
+            EventLoop.idle()
+            busy += time.perf_counter() - start
+        window.unbind(on_flip=count_draw)
+        window.dispatch('on_restore')
+
+        seconds = frames * FRAME_DT
+        calls = sum(entry[0] for entry in self.callbacks.values()) - calls
+        return {
+            'callbacks_per_s': round(calls / seconds, 2),
+            'redraws_per_s': round(draws[0] / seconds, 2),
+            'busy_ms_per_s': round(busy * 1000 / seconds, 3),
+        }
+
+    def report(self):
+        times = sorted(self.frame_times)
+        frames = len(times)
+        callbacks = {
+            name: {
+                'calls': calls,
+                'total_ms': round(total * 1000, 3),
+                'mean_ms': round(total / calls * 1000, 3),
+                'max_ms': round(worst * 1000, 3),
+            }
+            for name, (calls, total, worst) in sorted(self.callbacks.items())
+        }
+        return {
+            'frames': frames,
+            'frame_ms': {
+                'mean': round(sum(times) / frames * 1000, 3) if frames else 0.0,
+                'p50': round(percentile(times, 0.50) * 1000, 3),
+                'p95': round(percentile(times, 0.95) * 1000, 3),
+                'p99': round(percentile(times, 0.99) * 1000, 3),
+                'max': round(times[-1] * 1000, 3) if frames else 0.0,
+            },
+            'over_budget': sum(1 for t in times if t > FRAME_BUDGET),
+            'instructions': {
+                'max': max(self.instructions, default=0),
+                'last': self.instructions[-1] if self.instructions else 0,
+            },
+            'callbacks': callbacks,
+        }
+
+
+class InputDriver:
+    """Entrada sintética: toques, gestos, trazos, botones y teclas."""
+
+    def __init__(self, profiler, app):
+        self.profiler = profiler
+        self.app = app
+
+    def wait(self, frames):
+        for _ in range(frames):
+            self.profiler.frame()
+
+    def wait_until(self, predicate, limit=600):
+        """Avanza frames hasta que ``predicate()`` sea cierto (o hasta ``limit``)."""
+        for _ in range(limit):
+            if predicate():
+                return True
+            self.profiler.frame()
+        return predicate()
+
+    def stroke(self, points, moves_per_frame=1):
+        """Toque que recorre ``points`` [(x, y), ...] en coordenadas de ventana."""
+        from kivy.tests.common import UnitTestTouch
+
+        touch = UnitTestTouch(*points[0])
+        touch.touch_down()
+        self.profiler.frame()
+        for i, (x, y) in enumerate(points[1:], 1):
+            touch.touch_move(x, y)
+            if i % moves_per_frame == 0:
+                self.profiler.frame()
+        touch.touch_up()
+        self.profiler.frame()
+
+    def swipe(self, start, end, steps=6):
+        """Gesto en línea recta de ``start`` a ``end`` en ``steps`` frames."""
+        (x0, y0), (x1, y1) = start, end
+        self.stroke([(x0 + (x1 - x0) * i / steps, y0 + (y1 - y0) * i / steps)
+                     for i in range(steps + 1)])
+
+    def tap(self, x, y):
+        self.stroke([(x, y)])
+
+    def press(self, text):
+        """Pulsa el botón de la app cuyo texto es ``text``."""
+        from kivy.uix.button import Button
+
+        for widget in self.app.root.walk():
+            if isinstance(widget, Button) and widget.text == text \
+                    and widget.get_root_window() is not None:
+                self.tap(*widget.to_window(*widget.center))
+                return
+        raise LookupError(f'no hay ningún botón visible con el texto {text!r}')
+
+    def key(self, name, modifiers=()):
+        """Pulsa y suelta una tecla como lo hace la ventana SDL."""
+        from kivy.core.window import Keyboard, Window
+
+        key = Keyboard.keycodes.get(name, ord(name[0]))
+        codepoint = name if len(name) == 1 else None
+        modifiers = list(modifiers)
+        Window.dispatch('on_key_down', key, 0, codepoint, modifiers)
+        Window.dispatch('on_keyboard', key, 0, codepoint, modifiers)
+        self.profiler.frame()
+        Window.dispatch('on_key_up', key, 0)
+        self.profiler.frame()
+
+    def type(self, text_input, text):
+        """Escribe ``text`` en un TextInput letra a letra, una por frame."""
+        text_input.focus = True
+        for char in text:
+            text_input.insert_text(char)
+            self.profiler.frame()
+
+
+# --------------------------------------------------------------------------
+# Guiones de cada demo
+# --------------------------------------------------------------------------
+
+def scenario_countdown(driver):
+    # La cuenta atrás es una animación: solo hay que dejarla correr
+    driver.wait(300)
+
+
+def scenario_clock(driver):
+    # Cinco segundos virtuales: cinco llamadas del Clock
+    driver.wait(300)
+
+
+def scenario_login(driver):
+    screen = driver.app.root
+    driver.type(screen.username, 'profiler')
+    driver.type(screen.password, 'secret-password')
+    driver.type(screen.confirm_password, 'secret-password')
+    for button in ('Register', 'Login'):
+        driver.press(button)
+        # El hash va en otro hilo: se espera a que vuelva el resultado
+        driver.wait_until(lambda: not screen.login_button.disabled, limit=6000)
+
+
+def scenario_calculator(driver):
+    for expression in ('12+7=', '9*8-3=', '7/0='):
+        for key in expression:
+            driver.press(key)
+        driver.wait(10)
+        driver.press('AC')
+    # Teclado: una tecla por frame, con cursor y borrado
+    for name in '(3+4)*2':
+        driver.key(name)
+    for name in ('left', 'backspace', 'home', 'end', 'enter', 'delete'):
+        driver.key(name)
+    # Un pegado largo llega entero en un solo frame
+    driver.app.root.press('+'.join(str(i) for i in range(500)))
+    driver.wait(10)
+    driver.key('enter')
+    driver.wait(10)
+
+
+def scenario_paint(driver):
+    width, height = driver.app.root.size
+    # Trazos largos con varios eventos de movimiento por frame
+    for row in range(6):
+        y = height * (row + 1) / 8
+        points = [(width * 0.1 + i * 2, y + 20 * ((i // 10) % 2)) for i in range(300)]
+        driver.stroke(points, moves_per_frame=4)
+    driver.key('z', ['ctrl'])
+    driver.key('y', ['ctrl'])
+    # Goma sobre los trazos
+    driver.key('g')
+    driver.stroke([(width / 2, height * i / 40) for i in range(40)], moves_per_frame=2)
+    # Selección y borrado del trazo de arriba
+    driver.key('s')
+    driver.tap(width * 0.1 + 100, height * 6 / 8)
+    driver.key('delete')
+    driver.key('z', ['ctrl'])
+    driver.key('p')
+
+
+def _start_snake(driver):
+    driver.press('Iniciar Juego')
+    # Se espera a que termine la transición y arranque el juego
+    driver.wait_until(lambda: driver.app.root.current_screen.name == 'game')
+    driver.wait(SETTLE_FRAMES)
+
+
+def scenario_snake(driver):
+    _start_snake(driver)
+    game = driver.app.root.get_screen('game').game_widget
+    cx, cy = game.center
+    # Un cuadrado pequeño para no chocar con los bordes
+    for dx, dy in ((0, 1), (-1, 0), (0, -1), (1, 0)) * 3:
+        driver.swipe((cx, cy), (cx + dx * 120, cy + dy * 120))
+        driver.wait(30)
+
+
+def scenario_snake_keys(driver):
+    _start_snake(driver)
+    for name in ('up', 'left', 'down', 'right') * 3:
+        driver.key(name)
+        driver.wait(30)
+
+
+SCENARIOS = {
+    'countdown': scenario_countdown,
+    'clock': scenario_clock,
+    'login': scenario_login,
+    'calculator': scenario_calculator,
+    'paint': scenario_paint,
+    'snake': scenario_snake,
+    'snake-keys': scenario_snake_keys,
+    'snake-v2': scenario_snake_keys,
+}
+
+
+# --------------------------------------------------------------------------
+# Ejecución y comparación de informes
+# --------------------------------------------------------------------------
+
+def profile_app(name):
+    """Arranca la demo ``name`` en este proceso, ejecuta su guion y devuelve el informe."""
+    # Mismo guion, misma comida y mismas posiciones en cada ejecución
+    random.seed(0)
+    app = load_app_class(name)()
+    profiler = FrameProfiler()
+    profiler.install()
+    app._run_prepare()
+    driver = InputDriver(profiler, app)
+    driver.wait(SETTLE_FRAMES)
+    SCENARIOS[name](driver)
+    driver.wait(SETTLE_FRAMES)
+    report = profiler.report()
+    report['idle'] = profiler.measure_idle()
+    app.stop()
+    return report
+
+
+def run_child(name, output):
+    """Perfila una demo en un proceso aparte, con la ventana y los datos aislados."""
+    env = dict(os.environ)
+    env.update(headless_environment())
+    with tempfile.TemporaryDirectory() as workdir:
+        # Los ficheros que guarden las apps (usuarios, dibujos) van a un directorio temporal
+        env['XDG_CONFIG_HOME'] = workdir
+        result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name,
+                                 '--json', output], cwd=workdir, env=env,
+                                capture_output=True, text=True)
+    if result.returncode != 0:
+        lines = (result.stderr or result.stdout).strip().splitlines()
+        return {'error': lines[-1] if lines else f'código de salida {result.returncode}'}
+    with open(output, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def environment_info():
+    info = {'python': platform.python_version(), 'platform': platform.platform(),
+            'frame_dt': FRAME_DT}
+    try:
+        # Sin importar kivy en el proceso principal
+        info['kivy'] = metadata.version('kivy')
+    except metadata.PackageNotFoundError:
+        pass
+    return info
+
+
+def compare(old, new, threshold):
+    """Líneas con lo que ha empeorado de ``old`` a ``new`` más que ``threshold`` (%)."""
+    regressions = []
+    limit = 1 + threshold / 100.0
+    for name, current in new['apps'].items():
+        previous = old['apps'].get(name)
+        if previous is None or 'error' in previous:
+            continue
+        if 'error' in current:
+            regressions.append(f'{name}: falla ({current["error"]})')
+            continue
+        for stat in ('p50', 'p95'):
+            a, b = previous['frame_ms'][stat], current['frame_ms'][stat]
+            if b > a * limit and b - a > MIN_REGRESSION_MS:
+                regressions.append(f'{name}: frame {stat} {a:.2f} -> {b:.2f} ms')
+        a, b = previous['instructions']['max'], current['instructions']['max']
+        if b > a * limit:
+            regressions.append(f'{name}: instrucciones {a} -> {b}')
+        for stat in ('callbacks_per_s', 'redraws_per_s'):
+            a, b = previous['idle'][stat], current['idle'][stat]
+            if b > a * limit and b - a >= 1:
+                regressions.append(f'{name}: en reposo {stat} {a:g} -> {b:g}')
+        for callback, stats in current['callbacks'].items():
+            before = previous['callbacks'].get(callback)
+            if before and stats['mean_ms'] > before['mean_ms'] * limit \
+                    and stats['mean_ms'] - before['mean_ms'] > MIN_REGRESSION_MS:
+                regressions.append(f'{name}: {callback} {before["mean_ms"]:.2f} -> '
+                                   f'{stats["mean_ms"]:.2f} ms por llamada')
+    return regressions
+
+
+def format_report(report, top=5):
+    lines = []
+    for name, result in report['apps'].items():
+        if 'error' in result:
+            lines.append(f'{name:<12} ERROR: {result["error"]}')
+            continue
+        frame = result['frame_ms']
+        lines.append(f'{name:<12} {result["frames"]:5d} frames  p50 {frame["p50"]:6.2f} ms  '
+                     f'p95 {frame["p95"]:6.2f} ms  max {frame["max"]:7.2f} ms  '
+                     f'{result["over_budget"]:4d} lentos  '
+                     f'{result["instructions"]["max"]:6d} instrucciones')
+        idle = result['idle']
+        lines.append(f'    en reposo: {idle["callbacks_per_s"]:g} callbacks/s, '
+                     f'{idle["redraws_per_s"]:g} redibujados/s, '
+                     f'{idle["busy_ms_per_s"]:.2f} ms de bucle por segundo')
+        ranked = sorted(result['callbacks'].items(), key=lambda item: item[1]['total_ms'],
+                        reverse=True)
+        for callback, stats in ranked[:top]:
+            lines.append(f'    {callback:<48} {stats["calls"]:5d} x {stats["mean_ms"]:7.3f} ms'
+                         f'  (máx {stats["max_ms"]:.3f} ms)')
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Perfila las demos sin pantalla con entrada sintética.')
+    parser.add_argument('apps', nargs='*', metavar='app',
+                        help=f'demos a perfilar (por defecto todas): {", ".join(SCENARIOS)}')
+    parser.add_argument('--json', help='guarda el informe en este fichero')
+    parser.add_argument('--compare', help='informe anterior con el que comparar')
+    parser.add_argument('--threshold', type=float, default=25.0,
+                        help='empeoramiento máximo permitido en %% (por defecto 25)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        os.environ.setdefault('KIVY_NO_ARGS', '1')
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(profile_app(args.child), f)
+        return 0
+
+    unknown = [name for name in args.apps if name not in SCENARIOS]
+    if unknown:
+        parser.error(f'demo desconocida: {", ".join(unknown)}')
+
+    report = {'environment': environment_info(), 'apps': {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.apps or list(SCENARIOS):
+            report['apps'][name] = run_child(name, os.path.join(tmp, f'{name}.json'))
+    print(format_report(report))
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    failed = any('error' in result for result in report['apps'].values())
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            print(f'\nEmpeoran más de un {args.threshold:g} %:')
+            print('\n'.join(f'  {line}' for line in regressions))
+            failed = True
+        else:
+            print(f'\nSin empeoramientos de más de un {args.threshold:g} %.')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
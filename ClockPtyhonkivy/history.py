@@ -0,0 +1,154 @@
+'''
+Deshacer / rehacer para DrawingCanvas.
+
+Cada operación sobre los trazos se guarda como un comando en un registro.
+Cada ``interval`` comandos se toma un checkpoint del estado (lista de trazos
+y píxeles de la capa). Deshacer restaura el checkpoint más cercano y vuelve a
+aplicar solo los comandos posteriores, así que su coste no depende de la
+longitud del historial sino de ``interval``.
+
+La memoria de los checkpoints se cuenta y tiene un tope: al superarlo se
+descarta el checkpoint más antiguo junto con los comandos anteriores a él,
+que dejan de poder deshacerse.
+'''
+
+from collections import OrderedDict
+
+# Comandos entre checkpoints
+CHECKPOINT_INTERVAL = 20
+# Tope de memoria para los checkpoints (bytes)
+MAX_CHECKPOINT_BYTES = 64 * 1024 * 1024
+
+
+class AddStroke:
+    """Añade un trazo terminado."""
+
+    __slots__ = ('stroke',)
+
+    def __init__(self, stroke):
+        self.stroke = stroke
+
+
+class EraseStrokes:
+    """Borra uno o varios trazos (un gesto de goma es un solo comando)."""
+
+    __slots__ = ('strokes',)
+
+    def __init__(self, strokes):
+        self.strokes = list(strokes)
+
+
+class History:
+    """
+    Registro de comandos con checkpoints periódicos.
+
+    Quien lo usa aporta tres funciones:
+
+    * ``apply(command)`` aplica un comando al estado actual.
+    * ``snapshot()`` devuelve ``(estado, bytes)`` del estado actual.
+    * ``restore(estado)`` vuelve a un estado guardado; ``None`` es el
+      estado inicial (lienzo vacío).
+
+    Si el estado cambia fuera del registro (por ejemplo, al cargar un
+    dibujo), hay que llamar a checkpoint() para que deshacer vuelva a él y
+    no al lienzo vacío.
+    """
+
+    def __init__(self, apply, snapshot, restore,
+                 interval=CHECKPOINT_INTERVAL, max_bytes=MAX_CHECKPOINT_BYTES):
+        self._apply = apply
+        self._snapshot = snapshot
+        self._restore = restore
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self.clear()
+
+    def clear(self):
+        """Olvida todo el historial (el estado actual pasa a ser el inicial)."""
+        self._log = []
+        # Comandos descartados por el principio del registro
+        self._offset = 0
+        # Número de comandos aplicados; los siguientes se pueden rehacer
+        self.position = 0
+        # posición -> (estado, bytes), de más antiguo a más reciente
+        self._checkpoints = OrderedDict()
+        self.checkpoint_bytes = 0
+
+    @property
+    def can_undo(self):
+        return self.position > self._offset
+
+    @property
+    def can_redo(self):
+        return self.position < self._offset + len(self._log)
+
+    def push(self, command):
+        """Aplica un comando nuevo (se pierde lo que se podía rehacer)."""
+        del self._log[self.position - self._offset:]
+        for position in [p for p in self._checkpoints if p > self.position]:
+            self._drop_checkpoint(position)
+
+        self._log.append(command)
+        self._apply(command)
+        self.position += 1
+        self._maybe_checkpoint()
+
+    def undo(self):
+        """Deshace el último comando. Devuelve False si no hay nada que deshacer."""
+        if not self.can_undo:
+            return False
+        target = self.position - 1
+        base = self._offset
+        for position in reversed(self._checkpoints):
+            if position <= target:
+                base = position
+                break
+
+        if base in self._checkpoints:
+            self._restore(self._checkpoints[base][0])
+        else:
+            self._restore(None)
+        for command in self._log[base - self._offset:target - self._offset]:
+            self._apply(command)
+        self.position = target
+        return True
+
+    def redo(self):
+        """Rehace el último comando deshecho. Devuelve False si no hay ninguno."""
+        if not self.can_redo:
+            return False
+        self._apply(self._log[self.position - self._offset])
+        self.position += 1
+        self._maybe_checkpoint()
+        return True
+
+    def checkpoint(self):
+        """Guarda el estado actual como checkpoint de la posición actual."""
+        if self.position in self._checkpoints:
+            self._drop_checkpoint(self.position)
+        self._take_checkpoint()
+
+    def _maybe_checkpoint(self):
+        if self.position % self.interval or self.position in self._checkpoints:
+            return
+        self._take_checkpoint()
+
+    def _take_checkpoint(self):
+        state, size = self._snapshot()
+        self._checkpoints[self.position] = (state, size)
+        self.checkpoint_bytes += size
+
+        # Respeta el tope de memoria descartando los más antiguos. El más
+        # reciente se conserva siempre.
+        while self.checkpoint_bytes > self.max_bytes and len(self._checkpoints) > 1:
+            oldest = next(iter(self._checkpoints))
+            self._drop_checkpoint(oldest)
+            # Sin ese checkpoint no se puede reconstruir lo anterior al
+            # siguiente: el registro empieza ahora en él
+            start = next(iter(self._checkpoints))
+            del self._log[:start - self._offset]
+            self._offset = start
+
+    def _drop_checkpoint(self, position):
+        _, size = self._checkpoints.pop(position)
+        self.checkpoint_bytes -= size
@@ -0,0 +1,60 @@
+'''
+Agrupación por frame de los eventos de movimiento táctil.
+
+Un lápiz o una pantalla de alta frecuencia mandan varios on_touch_move por
+cada frame que se dibuja. MotionCoalescer guarda las muestras de cada toque
+en un ``array('f')`` (x0, y0, x1, y1...) y entrega el lote completo una sola
+vez por frame, justo antes de dibujar, así el widget actualiza sus
+instrucciones una vez por frame y no por evento.
+
+Los contadores ``events_received`` y ``batches_processed`` permiten ver
+cuántos eventos se han ahorrado.
+'''
+
+from array import array
+
+from kivy.clock import Clock
+
+
+class MotionCoalescer:
+    """
+    Acumula muestras por toque y llama a ``callback(touch, coords)`` una vez
+    por frame con todas las muestras de ese toque.
+    """
+
+    def __init__(self, callback):
+        self._callback = callback
+        # touch.uid -> (touch, coordenadas pendientes)
+        self._pending = {}
+        self.events_received = 0
+        self.batches_processed = 0
+        # timeout -1: se ejecuta en el mismo frame, antes de dibujar
+        self._trigger = Clock.create_trigger(self.flush, -1)
+
+    def push(self, touch, x, y):
+        """Guarda una muestra del toque; el lote se entrega antes del próximo dibujado."""
+        pending = self._pending.get(touch.uid)
+        if pending is None:
+            pending = self._pending[touch.uid] = (touch, array('f'))
+        pending[1].append(x)
+        pending[1].append(y)
+        self.events_received += 1
+        self._trigger()
+
+    def flush(self, *args):
+        """Entrega todos los lotes pendientes."""
+        pending = self._pending
+        self._pending = {}
+        for touch, coords in pending.values():
+            self.batches_processed += 1
+            self._callback(touch, coords)
+
+    def flush_touch(self, touch):
+        """Entrega ya el lote de un toque (por ejemplo antes de on_touch_up)."""
+        pending = self._pending.pop(touch.uid, None)
+        if pending is not None:
+            self.batches_processed += 1
+            self._callback(*pending)
+
+    def summary(self):
+        return f'{self.events_received} eventos de movimiento en {self.batches_processed} lotes'
@@ -0,0 +1,241 @@
+'''
+Caché en disco de las reglas KV ya compiladas.
+
+Cada vez que arranca una app, Builder vuelve a leer y compilar sus ficheros
+.kv, y también el style.kv de Kivy (unas 1500 líneas que se cargan al
+importar kivy.lang). Con install() el Parser de Kivy pasa a guardar el
+resultado (reglas, plantillas, clases dinámicas y el código compilado de
+cada expresión) en CACHE_DIR y a reutilizarlo en los siguientes arranques.
+
+La clave de cada entrada es un SHA-256 del contenido y la ruta del .kv, la
+versión de Kivy y la de los bytecodes de Python: si cambia cualquiera de
+ellas se vuelve a compilar. Las directivas ``#:import``, ``#:set``,
+``#:include`` y ``#:kivy`` se vuelven a ejecutar al leer de la caché porque
+tienen efectos fuera del Parser.
+
+install() tiene que llamarse antes de importar kivy.lang (o cualquier
+widget) para que cubra también style.kv:
+
+    import kv_cache
+    kv_cache.install()
+
+La caché se puede preparar como paso de build:
+
+    python kv_cache.py calculator.kv Drawing.kv
+    python kv_cache.py --clear
+
+Con KV_CACHE=0 en el entorno install() no hace nada, para comparar.
+'''
+
+import argparse
+import copyreg
+import glob
+import hashlib
+import importlib.util
+import io
+import marshal
+import os
+import pickle
+import sys
+import types
+
+# Directorio de la caché (se puede cambiar con KV_CACHE_DIR)
+CACHE_DIR = os.environ.get(
+    'KV_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.kvcache'))
+# KV_CACHE=0 desactiva la caché aunque la app llame a install()
+ENABLED = os.environ.get('KV_CACHE', '1') != '0'
+# Versión del formato de las entradas; subirla invalida las anteriores
+FORMAT_VERSION = 1
+
+# Los objetos de código no se pueden picklear: se guardan con marshal
+_DISPATCH = copyreg.dispatch_table.copy()
+_DISPATCH[types.CodeType] = lambda code: (marshal.loads, (marshal.dumps(code),))
+
+# Contadores de la sesión, para el benchmark y para depurar
+stats = {'hits': 0, 'misses': 0}
+
+
+def cache_key(content, filename):
+    import kivy
+
+    digest = hashlib.sha256()
+    for part in (str(FORMAT_VERSION), kivy.__version__, filename or '<string>'):
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    digest.update(importlib.util.MAGIC_NUMBER)
+    digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cache_path(content, filename):
+    return os.path.join(CACHE_DIR, cache_key(content, filename) + '.kvc')
+
+
+class _ParserPickler(pickle.Pickler):
+    """Guarda el estado de un Parser; las referencias al propio Parser (ctx) van aparte."""
+
+    dispatch_table = _DISPATCH
+
+    def __init__(self, file, parser):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._parser = parser
+
+    def persistent_id(self, obj):
+        return 'ctx' if obj is self._parser else None
+
+
+class _ParserUnpickler(pickle.Unpickler):
+
+    def __init__(self, file, parser):
+        super().__init__(file)
+        self._parser = parser
+
+    def persistent_load(self, pid):
+        if pid != 'ctx':
+            raise pickle.UnpicklingError(f'referencia desconocida {pid!r}')
+        return self._parser
+
+
+def _make_cached_parser(parser_module):
+    """Subclase del Parser de ``parser_module`` que lee y guarda sus reglas en la caché."""
+    Parser = parser_module.Parser
+
+    class CachedParser(Parser):
+        __slots__ = ()
+        _kv_cached = True
+
+        def __init__(self, **kwargs):
+            if parser_module.Parser is CachedParser:
+                # Parser.__init__ llama a super(Parser, self) con el nombre
+                # global del módulo: tiene que volver a ser el original
+                parser_module.Parser = Parser
+            content = kwargs.get('content')
+            if content is None:
+                super().__init__(**kwargs)
+                return
+            path = cache_path(content, kwargs.get('filename'))
+            if self._load(path):
+                stats['hits'] += 1
+                self.execute_directives()
+                return
+            stats['misses'] += 1
+            super().__init__(**kwargs)
+            self._store(path)
+
+        def _state(self):
+            return {name: getattr(self, name) for name in Parser.__slots__}
+
+        def _load(self, path):
+            try:
+                with open(path, 'rb') as f:
+                    state = _ParserUnpickler(f, self).load()
+            except Exception:
+                # No existe, está corrupta o es de otra versión: se vuelve a compilar
+                return False
+            for name, value in state.items():
+                setattr(self, name, value)
+            return True
+
+        def _store(self, path):
+            buffer = io.BytesIO()
+            try:
+                _ParserPickler(buffer, self).dump(self._state())
+            except (pickle.PicklingError, TypeError, AttributeError):
+                # Algo que no se puede guardar: este fichero no se cachea
+                return
+            tmp = f'{path}.{os.getpid()}.tmp'
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(tmp, 'wb') as f:
+                    f.write(buffer.getvalue())
+                os.replace(tmp, path)
+            except OSError:
+                # Sin permiso de escritura: la app sigue funcionando sin caché
+                pass
+
+    return CachedParser
+
+
+def _patch(parser_module):
+    builder = sys.modules.get('kivy.lang.builder')
+    if builder is not None and hasattr(builder, 'Builder'):
+        # Builder ya está cargado: basta con cambiar el nombre que usa
+        if not getattr(builder.Parser, '_kv_cached', False):
+            builder.Parser = _make_cached_parser(parser_module)
+    else:
+        # kivy.lang.builder está a punto de hacer «from kivy.lang.parser
+        # import Parser» y de cargar style.kv: se le deja la subclase en el
+        # módulo, que vuelve al Parser original en cuanto se usa
+        parser_module.Parser = _make_cached_parser(parser_module)
+
+
+class _ParserHook:
+    """Buscador de imports que instala la caché en cuanto se carga kivy.lang.parser."""
+
+    def find_spec(self, name, path=None, target=None):
+        if name != 'kivy.lang.parser':
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def exec_and_patch(module):
+            exec_module(module)
+            _patch(module)
+
+        spec.loader.exec_module = exec_and_patch
+        return spec
+
+
+def install():
+    """Hace que Builder use la caché. Mejor antes de importar kivy.lang."""
+    if not ENABLED:
+        return
+    parser_module = sys.modules.get('kivy.lang.parser')
+    if parser_module is not None:
+        _patch(parser_module)
+    elif not any(isinstance(finder, _ParserHook) for finder in sys.meta_path):
+        sys.meta_path.insert(0, _ParserHook())
+
+
+def clear():
+    """Borra todas las entradas de la caché."""
+    removed = 0
+    for path in glob.glob(os.path.join(CACHE_DIR, '*.kvc')):
+        os.remove(path)
+        removed += 1
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompila ficheros .kv en la caché.')
+    parser.add_argument('files', nargs='*',
+                        help='ficheros .kv (por defecto todos los de este directorio)')
+    parser.add_argument('--clear', action='store_true', help='borra la caché')
+    args = parser.parse_args()
+
+    if args.clear:
+        print(f'{clear()} entradas borradas de {CACHE_DIR}')
+        return
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+    install()
+    # Importar kivy.lang ya compila (o lee de la caché) el style.kv de Kivy
+    from kivy.lang import builder
+    from kivy.resources import resource_find
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    files = args.files or sorted(glob.glob(os.path.join(here, '*.kv')))
+    for filename in files:
+        # La misma ruta que usará Builder.load_file, que forma parte de la clave
+        filename = resource_find(filename) or filename
+        hits = stats['hits']
+        with open(filename, encoding='utf-8') as f:
+            builder.Parser(content=f.read(), filename=filename)
+        print(f'{filename}: {"ya estaba en la caché" if stats["hits"] > hits else "compilado"}')
+    print(f'Caché en {CACHE_DIR}')
+
+
+if __name__ == '__main__':
+    main()
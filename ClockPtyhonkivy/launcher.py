@@ -0,0 +1,207 @@
+'''
+Lanzador único de las demos.
+
+Importa solo la app elegida (y lo que esa app importe), la arranca y mide el
+tiempo hasta el primer frame con un desglose de los imports más caros:
+
+    python launcher.py paint
+    python launcher.py snake --profile --exit-after-first-frame
+    python launcher.py --list
+
+Con --json el informe se guarda también en un fichero, para poder comparar
+el arranque en frío entre versiones y dispositivos.
+'''
+
+import time
+
+# Referencia para el tiempo hasta el primer frame
+_START = time.perf_counter()
+
+import argparse
+import builtins
+import importlib.util
+import json
+import os
+import sys
+
+# Demos disponibles: nombre -> (fichero, clase App)
+APPS = {
+    'countdown': ('ClockPtyhonkivy.py', 'TimeApp'),
+    'clock': ('ClockDemo.py', 'ClockDemo'),
+    'login': ('Login.py', 'MyApp'),
+    'calculator': ('calculator.py', 'CalculatorApp'),
+    'paint': ('EjemploPintar.py', 'DrawingApp'),
+    'snake': ('snake.py', 'SnakeGameApp'),
+    'snake-keys': ('class1.py', 'SnakeGameApp'),
+    'snake-v2': ('snake.v2.py', 'SnakeGameApp'),
+}
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class ImportProfiler:
+    """
+    Mide cuánto tarda cada módulo en importarse mientras está activo.
+
+    Guarda el tiempo propio de cada módulo (sin contar los imports que hace
+    dentro) para que el desglose sume el total.
+    """
+
+    def __init__(self):
+        self.self_times = {}
+        self._stack = []
+        self._import = None
+
+    def __enter__(self):
+        self._import = builtins.__import__
+        builtins.__import__ = self._timed_import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level == 0 and not fromlist and name in sys.modules:
+            # Ya importado: no cuesta nada medirlo
+            return self._import(name, globals, locals, fromlist, level)
+
+        before = set(sys.modules)
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            # El tiempo propio se apunta al módulo de más arriba en la cadena:
+            # importlib lo vuelve a meter al final de sys.modules al terminar
+            loaded = next((module for module in reversed(sys.modules) if module not in before), None)
+            if loaded is not None:
+                self.self_times[loaded] = self.self_times.get(loaded, 0.0) + elapsed - children
+
+    def measure(self, name, func, *args):
+        """Llama a func(*args) apuntando su tiempo propio a ``name``."""
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.self_times[name] = elapsed - self._stack.pop()
+
+    def grouped(self, depth=2):
+        """Tiempos agrupados por prefijo del módulo (p. ej. kivy.core)."""
+        groups = {}
+        for name, seconds in self.self_times.items():
+            key = '.'.join(name.split('.')[:depth])
+            groups[key] = groups.get(key, 0.0) + seconds
+        return groups
+
+
+def load_app_class(name):
+    """Importa el fichero de la demo ``name`` y devuelve su clase App."""
+    filename, class_name = APPS[name]
+    path = os.path.join(HERE, filename)
+    module_name = os.path.splitext(filename)[0].replace('.', '_')
+    if HERE not in sys.path:
+        sys.path.insert(0, HERE)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return getattr(module, class_name)
+
+
+class StartupReport:
+    """Fases del arranque en segundos desde que se cargó el lanzador."""
+
+    def __init__(self, app_name):
+        self.app_name = app_name
+        self.phases = {}
+        self.imports = {}
+
+    def mark(self, phase):
+        self.phases[phase] = time.perf_counter() - _START
+
+    def as_dict(self):
+        return {'app': self.app_name, 'phases': self.phases, 'imports': self.imports}
+
+    def format(self, top=15):
+        lines = [f'Arranque de {self.app_name}:']
+        for phase, seconds in self.phases.items():
+            lines.append(f'  {phase:<22} {seconds * 1000:8.1f} ms')
+        if self.imports:
+            lines.append('Imports más caros (tiempo propio):')
+            ranked = sorted(self.imports.items(), key=lambda item: item[1], reverse=True)
+            for module, seconds in ranked[:top]:
+                lines.append(f'  {module:<30} {seconds * 1000:8.1f} ms')
+        return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lanza una de las demos de Kivy.')
+    parser.add_argument('app', nargs='?', choices=sorted(APPS), help='demo a lanzar')
+    parser.add_argument('--list', action='store_true', help='muestra las demos disponibles')
+    parser.add_argument('--profile', action='store_true',
+                        help='muestra el tiempo hasta el primer frame y el desglose de imports')
+    parser.add_argument('--json', help='guarda el informe de arranque en este fichero')
+    parser.add_argument('--exit-after-first-frame', action='store_true',
+                        help='cierra la app en cuanto se dibuja el primer frame')
+    parser.add_argument('--no-kv-cache', action='store_true',
+                        help='compila las reglas KV sin usar la caché de kv_cache')
+    args = parser.parse_args()
+
+    if args.list or not args.app:
+        for name, (filename, class_name) in sorted(APPS.items()):
+            print(f'{name:<12} {filename} ({class_name})')
+        return
+
+    # Kivy no debe interpretar los argumentos del lanzador
+    os.environ.setdefault('KIVY_NO_ARGS', '1')
+
+    if args.no_kv_cache:
+        # También para las apps que instalan la caché por su cuenta
+        os.environ['KV_CACHE'] = '0'
+    else:
+        # Antes de importar la app, para que style.kv también salga de la caché
+        import kv_cache
+        kv_cache.install()
+
+    report = StartupReport(args.app)
+    profile = args.profile or args.json
+    if profile:
+        with ImportProfiler() as profiler:
+            app_class = profiler.measure(APPS[args.app][0], load_app_class, args.app)
+        report.imports = profiler.grouped()
+    else:
+        app_class = load_app_class(args.app)
+    report.mark('import de la app')
+
+    app = app_class()
+
+    def on_start(*largs):
+        report.mark('build + on_start')
+        # La ventana ya existe aquí; el primer on_flip es el primer frame
+        from kivy.core.window import Window
+
+        def on_first_flip(*largs):
+            Window.unbind(on_flip=on_first_flip)
+            report.mark('primer frame')
+            if profile:
+                print(report.format())
+            if args.json:
+                with open(args.json, 'w', encoding='utf-8') as f:
+                    json.dump(report.as_dict(), f, indent=2)
+            if args.exit_after_first_frame:
+                app.stop()
+
+        Window.bind(on_flip=on_first_flip)
+
+    app.bind(on_start=on_start)
+    app.run()
+
+
+if __name__ == '__main__':
+    main()
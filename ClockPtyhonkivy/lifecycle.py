@@ -0,0 +1,87 @@
+'''
+Intervalos del Clock que no gastan CPU cuando la app no se ve.
+
+Un Clock.schedule_interval sigue despertando al bucle aunque la pantalla que
+lo programó ya no esté activa, la app esté en pausa (Android/iOS) o la
+ventana esté minimizada u oculta. LifecycleScheduler guarda sus intervalos y
+los cancela mientras la app está en pausa o la ventana no se ve, y los
+vuelve a programar al volver. Las pantallas los arrancan al entrar
+(on_enter) y los quitan al salir (on_pre_leave).
+'''
+
+from kivy.app import App
+from kivy.clock import Clock
+
+
+class LifecycleScheduler:
+    """
+    Programa intervalos del Clock que se paran solos con la app en pausa o
+    la ventana minimizada u oculta.
+    """
+
+    def __init__(self):
+        # callback -> [intervalo, evento del Clock o None si está parado]
+        self._intervals = {}
+        # Motivos por los que está parado: 'app' y/o 'window'
+        self._paused = set()
+        self._bound = False
+
+    @property
+    def running(self):
+        return not self._paused
+
+    def schedule_interval(self, callback, interval):
+        """Llama a ``callback`` cada ``interval`` segundos mientras la app se vea."""
+        self.unschedule(callback)
+        self._bind_lifecycle()
+        event = Clock.schedule_interval(callback, interval) if self.running else None
+        self._intervals[callback] = [interval, event]
+
+    def unschedule(self, callback=None):
+        """Quita el intervalo de ``callback``, o todos si no se indica."""
+        callbacks = list(self._intervals) if callback is None else [callback]
+        for callback in callbacks:
+            entry = self._intervals.pop(callback, None)
+            if entry is not None and entry[1] is not None:
+                entry[1].cancel()
+
+    def pause(self, reason):
+        """Cancela los intervalos hasta que se llame a resume() con el mismo motivo."""
+        if self.running:
+            for entry in self._intervals.values():
+                if entry[1] is not None:
+                    entry[1].cancel()
+                    entry[1] = None
+        self._paused.add(reason)
+
+    def resume(self, reason):
+        self._paused.discard(reason)
+        if self.running:
+            for callback, entry in self._intervals.items():
+                if entry[1] is None:
+                    entry[1] = Clock.schedule_interval(callback, entry[0])
+
+    def _bind_lifecycle(self):
+        if self._bound:
+            return
+        self._bound = True
+        # La ventana se importa aquí para no crearla al importar el módulo
+        from kivy.core.window import Window
+
+        app = App.get_running_app()
+        if app is not None:
+            app.bind(on_pause=self._on_app_pause, on_resume=self._on_app_resume)
+        Window.bind(on_minimize=self._on_window_hidden, on_hide=self._on_window_hidden,
+                    on_restore=self._on_window_shown, on_show=self._on_window_shown)
+
+    def _on_app_pause(self, *args):
+        self.pause('app')
+
+    def _on_app_resume(self, *args):
+        self.resume('app')
+
+    def _on_window_hidden(self, *args):
+        self.pause('window')
+
+    def _on_window_shown(self, *args):
+        self.resume('window')
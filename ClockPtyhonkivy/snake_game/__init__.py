@@ -0,0 +1,19 @@
+'''
+Snake configurable: una sola implementación para todas las variantes.
+
+    engine.SnakeEngine      lógica de la partida (deque + set, sin Kivy)
+    render.GridRenderer     dibujo incremental en el canvas
+    inputs.SwipeInput       gestos de deslizamiento
+    inputs.KeyboardInput    teclas de flecha
+    game.SnakeGame          widget que une lo anterior con el reloj
+    screens.SnakeGameApp    pantallas y App; las variantes son subclases
+
+snake.py, snake.v2.py y class1.py solo eligen la cuadrícula, el ritmo, las
+entradas y el tamaño de la ventana.
+'''
+
+from .engine import SnakeEngine
+from .game import SnakeGame
+from .inputs import KeyboardInput, SwipeInput
+from .render import GridRenderer
+from .screens import GameOverScreen, GameScreen, SnakeGameApp, StartScreen
@@ -0,0 +1,92 @@
+'''
+Lógica del Snake, sin nada de Kivy.
+
+El cuerpo es un deque de celdas (x, y) con la cabeza a la izquierda y, al
+lado, un set con las mismas celdas. Avanzar es añadir la cabeza y quitar la
+cola del deque, y los choques se miran en el set: cada paso cuesta lo mismo
+con 5 segmentos que con 500, en lugar de recorrer la lista entera como antes
+(``snake.insert(0, ...)`` y ``[x, y] in snake``).
+'''
+
+import random
+from collections import deque
+
+import telemetry
+
+# Dirección -> desplazamiento (dx, dy) de la cabeza en cada paso
+DIRECTIONS = {'right': (1, 0), 'left': (-1, 0), 'up': (0, 1), 'down': (0, -1)}
+OPPOSITE = {'right': 'left', 'left': 'right', 'up': 'down', 'down': 'up'}
+
+
+class SnakeEngine:
+    """Partida en una cuadrícula de ``width`` x ``height`` celdas."""
+
+    def __init__(self, width, height, rng=random):
+        self.width = width
+        self.height = height
+        # Generador de la comida (un random.Random con semilla para repetir partidas)
+        self.rng = rng
+        # Cambia en cada reset(); el renderer lo usa para saber cuándo dibujarlo todo
+        self.generation = 0
+        self.reset()
+
+    def reset(self):
+        """Empieza una partida: un segmento en el centro que va a la derecha."""
+        head = (self.width // 2, self.height // 2)
+        self.set_body([head], 'right')
+        self.score = 0
+        self.game_over = False
+
+    def set_body(self, cells, direction):
+        """Coloca el Snake en ``cells`` (cabeza primero) y genera la comida."""
+        self.body = deque(cells)
+        self.cells = set(self.body)
+        self.direction = direction
+        # Permite guardar la siguiente dirección para evitar giros de 180°
+        self.next_direction = direction
+        self.generation += 1
+        self.food = self.generate_food()
+
+    def turn(self, direction):
+        """Cambia de dirección en el próximo paso, salvo que sea darse la vuelta."""
+        if direction in DIRECTIONS and direction != OPPOSITE[self.direction]:
+            self.next_direction = direction
+
+    @telemetry.timed('snake_generate_food')
+    def generate_food(self):
+        """Celda libre al azar para la comida (None si el Snake llena la cuadrícula)."""
+        if len(self.cells) >= self.width * self.height:
+            return None
+        randint = self.rng.randint
+        while True:
+            cell = (randint(0, self.width - 1), randint(0, self.height - 1))
+            if cell not in self.cells:
+                return cell
+
+    def step(self):
+        """
+        Avanza una celda. Devuelve 'eat' si ha comido, 'dead' si ha chocado
+        contra sí mismo o contra un borde y None en otro caso.
+        """
+        if self.game_over:
+            return None
+        self.direction = self.next_direction
+        dx, dy = DIRECTIONS[self.direction]
+        x, y = self.body[0]
+        head = (x + dx, y + dy)
+
+        # Como antes, la celda de la cola todavía cuenta como ocupada
+        if head in self.cells or not (0 <= head[0] < self.width and 0 <= head[1] < self.height):
+            self.game_over = True
+            return 'dead'
+
+        self.body.appendleft(head)
+        self.cells.add(head)
+        if head == self.food:
+            self.score += 1
+            telemetry.increment('snake_food_eaten')
+            self.food = self.generate_food()
+            return 'eat'
+        # Si no come, se quita la cola (movimiento normal)
+        self.cells.discard(self.body.pop())
+        return None
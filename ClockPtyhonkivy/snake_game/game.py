@@ -0,0 +1,95 @@
+'''
+Widget del juego: une el motor, el renderer, las entradas y el reloj.
+'''
+
+import random
+
+from kivy.app import App
+from kivy.clock import Clock
+from kivy.properties import NumericProperty
+from kivy.uix.widget import Widget
+
+import telemetry
+from lifecycle import LifecycleScheduler
+
+from .engine import SnakeEngine
+from .render import GridRenderer
+
+
+class SnakeGame(Widget):
+    """
+    Juego de Snake en una cuadrícula de ``grid`` = (ancho, alto) celdas de
+    ``cell_size`` píxeles, que avanza ``tick_rate`` veces por segundo.
+
+    ``inputs`` son las fuentes de giros (SwipeInput, KeyboardInput...) y
+    ``renderer`` lo que lo dibuja (GridRenderer por defecto).
+    """
+    # La pantalla de juego muestra la puntuación enlazándose a esta propiedad
+    score = NumericProperty(0)
+
+    def __init__(self, grid=(40, 40), cell_size=20, tick_rate=10, inputs=(), renderer=None,
+                 rng=random, **kwargs):
+        super().__init__(**kwargs)
+        self.cell_size = cell_size
+        self.tick_rate = tick_rate
+        self.engine = SnakeEngine(grid[0], grid[1], rng)
+        self.renderer = renderer if renderer is not None else GridRenderer()
+        # El bucle del juego se para solo con la app en pausa o minimizada
+        self.clock = LifecycleScheduler()
+        # Redibuja como mucho una vez por frame y solo cuando algo ha cambiado
+        self._redraw = Clock.create_trigger(self.draw_elements)
+        self.bind(size=self._redraw, pos=self._redraw)
+        # Se guardan aquí: bind() solo guarda referencias débiles a sus métodos
+        self.inputs = list(inputs)
+        for source in self.inputs:
+            source.attach(self)
+        # El motor ya empieza con una partida nueva: solo falta dibujarla
+        self._redraw()
+
+    @property
+    def grid_size(self):
+        """Tamaño en píxeles de la cuadrícula completa."""
+        return (self.engine.width * self.cell_size, self.engine.height * self.cell_size)
+
+    def start(self):
+        """Empieza una partida y actualiza el juego ``tick_rate`` veces por segundo."""
+        self.reset_game()
+        self.clock.schedule_interval(self.update, 1.0 / self.tick_rate)
+
+    def stop(self):
+        """Detiene el bucle de actualización."""
+        self.clock.unschedule(self.update)
+
+    def reset_game(self):
+        """Inicializa o reinicializa las variables del juego."""
+        self.engine.reset()
+        self.score = 0
+        self._redraw()
+
+    def turn(self, direction):
+        """Gira en el próximo paso; lo llaman las fuentes de entrada."""
+        self.engine.turn(direction)
+
+    @telemetry.timed('snake_update')
+    def update(self, dt):
+        """Función principal del juego, llamada repetidamente por Clock."""
+        event = self.engine.step()
+        if event == 'dead':
+            self.end_game()
+            return
+        if event == 'eat':
+            self.score = self.engine.score
+        self._redraw()
+
+    @telemetry.timed('snake_draw')
+    def draw_elements(self, *args):
+        """Dibuja el Snake y la comida en el canvas."""
+        self.renderer.draw(self, self.engine, self.cell_size)
+
+    @telemetry.timed('snake_end_game')
+    def end_game(self):
+        """Termina el juego y muestra la pantalla de fin de juego."""
+        # Detiene el bucle de actualización
+        self.stop()
+        # Llama al método de la App para ir a la pantalla de Game Over
+        App.get_running_app().show_game_over(self.score)
@@ -0,0 +1,79 @@
+'''
+Fuentes de entrada del Snake.
+
+Cada una se engancha al juego con attach(game) y le pide giros con
+game.turn(dirección); el juego ignora los giros de 180°.
+'''
+
+
+class SwipeInput:
+    """Gestos de deslizamiento (swipe) sobre la ventana."""
+
+    def __init__(self, mobile_only=False):
+        # Con mobile_only los toques se ignoran en escritorio, donde se juega con el teclado
+        self.mobile_only = mobile_only
+        self._game = None
+        self._touch_start = None
+
+    def attach(self, game):
+        from kivy.utils import platform
+
+        if self.mobile_only and platform not in ('android', 'ios'):
+            return
+        self._game = game
+        game.bind(on_touch_down=self._on_touch_down, on_touch_up=self._on_touch_up)
+
+    def _on_touch_down(self, game, touch):
+        # Se guarda la posición inicial del toque para calcular el swipe
+        self._touch_start = touch.pos
+
+    def _on_touch_up(self, game, touch):
+        """Calcula la dirección del swipe al soltar el toque."""
+        if self._touch_start is None:
+            return
+        dx = touch.x - self._touch_start[0]
+        dy = touch.y - self._touch_start[1]
+        self._touch_start = None
+        # Un swipe tiene que recorrer al menos una celda
+        threshold = game.cell_size
+
+        # Determina si el movimiento fue horizontal o vertical
+        if abs(dx) > abs(dy):
+            if dx > threshold:
+                game.turn('right')
+            elif dx < -threshold:
+                game.turn('left')
+        else:
+            if dy > threshold:
+                game.turn('up')
+            elif dy < -threshold:
+                game.turn('down')
+
+
+class KeyboardInput:
+    """Teclas de flecha del teclado (físico o virtual)."""
+
+    def __init__(self):
+        self._game = None
+        self._keyboard = None
+
+    def attach(self, game):
+        # La ventana se importa aquí (y no al importar el módulo) para
+        # no crearla antes de que la app la necesite
+        from kivy.core.window import Window
+
+        self._game = game
+        # Solicitamos el teclado virtual (funciona para desktop y mobile)
+        self._keyboard = Window.request_keyboard(self._keyboard_closed, game)
+        self._keyboard.bind(on_key_down=self._on_key_down)
+
+    def _keyboard_closed(self):
+        """Función que se llama cuando se cierra el teclado."""
+        if self._keyboard:
+            self._keyboard.unbind(on_key_down=self._on_key_down)
+        self._keyboard = None
+
+    def _on_key_down(self, keyboard, keycode, text, modifiers):
+        # 'up', 'down', 'left' o 'right'; el resto de teclas no hace nada
+        self._game.turn(keycode[1])
+        return True
@@ -0,0 +1,100 @@
+'''
+Dibujo del Snake en el canvas de un widget.
+
+Antes cada paso vaciaba el canvas y creaba un Rectangle por segmento. Ahora
+cada segmento conserva su Rectangle entre frames: en cada paso el de la cola
+se mueve a la nueva cabeza (o se añade uno si ha comido) y la comida solo
+cambia de posición. El canvas entero solo se rehace al empezar una partida o
+al cambiar el tamaño o la posición del widget.
+'''
+
+from collections import deque
+
+from kivy.graphics import Color, Ellipse, InstructionGroup, Rectangle
+
+
+class GridRenderer:
+    """Dibuja un SnakeEngine en el canvas del widget con celdas de ``cell_size`` píxeles."""
+
+    background_color = (0.2, 0.2, 0.2, 1)  # Gris oscuro
+    snake_color = (0, 0.8, 0, 1)  # Verde
+    food_color = (1, 0, 0, 1)  # Rojo
+
+    def __init__(self):
+        # (celda, Rectangle) de cada segmento, con la cabeza a la izquierda
+        self._segments = deque()
+        self._group = None
+        self._food = None
+        # (canvas, partida, pos, size, cell_size) del último dibujado completo
+        self._layout = None
+
+    def draw(self, widget, engine, cell_size):
+        layout = (widget.canvas, engine.generation, tuple(widget.pos), tuple(widget.size), cell_size)
+        if layout != self._layout or not self._follow(widget, engine, cell_size):
+            self._rebuild(widget, engine, cell_size)
+            self._layout = layout
+        if engine.food is None:
+            self._food.size = (0, 0)
+        else:
+            self._food.pos = self._cell_pos(widget, engine.food, cell_size)
+            self._food.size = (cell_size, cell_size)
+
+    @staticmethod
+    def _cell_pos(widget, cell, cell_size):
+        return (widget.x + cell[0] * cell_size, widget.y + cell[1] * cell_size)
+
+    def _rebuild(self, widget, engine, cell_size):
+        widget.canvas.clear()
+        self._segments.clear()
+        self._group = InstructionGroup()
+        with widget.canvas:
+            # Fondo del área de juego
+            Color(*self.background_color)
+            Rectangle(pos=widget.pos, size=widget.size)
+            Color(*self.snake_color)
+        widget.canvas.add(self._group)
+        for cell in engine.body:
+            rect = Rectangle(pos=self._cell_pos(widget, cell, cell_size), size=(cell_size, cell_size))
+            self._group.add(rect)
+            self._segments.append((cell, rect))
+        with widget.canvas:
+            # Comida (Ellipse para darle forma de manzana)
+            Color(*self.food_color)
+            self._food = Ellipse(size=(cell_size, cell_size))
+
+    def _follow(self, widget, engine, cell_size):
+        """
+        Pone los segmentos al día con los pasos dados desde el último frame.
+        Devuelve False si no se puede y hay que dibujarlo todo.
+        """
+        segments = self._segments
+        if not segments:
+            return False
+        # Las cabezas nuevas son las celdas del cuerpo anteriores a la cabeza
+        # de antes. Si la cabeza de antes ya no está (un Snake de un solo
+        # segmento, o más pasos que segmentos desde el último frame), todo el
+        # cuerpo es nuevo y se mueven todos los Rectangle.
+        old_head = segments[0][0]
+        heads = []
+        for cell in engine.body:
+            if cell == old_head:
+                break
+            heads.append(cell)
+
+        # Los segmentos que sobran por la cola se reutilizan para las cabezas
+        spare = []
+        while len(segments) + len(heads) > len(engine.body):
+            spare.append(segments.pop()[1])
+        size = (cell_size, cell_size)
+        for cell in reversed(heads):
+            pos = self._cell_pos(widget, cell, cell_size)
+            if spare:
+                rect = spare.pop()
+                rect.pos = pos
+            else:
+                rect = Rectangle(pos=pos, size=size)
+                self._group.add(rect)
+            segments.appendleft((cell, rect))
+        for rect in spare:
+            self._group.remove(rect)
+        return True
@@ -0,0 +1,177 @@
+'''
+Pantallas del Snake y la App que las reúne.
+
+Cada variante (snake.py, snake.v2.py, class1.py) es una subclase de
+SnakeGameApp que solo cambia sus atributos de configuración.
+'''
+
+from kivy.app import App
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.screenmanager import ScreenManager, Screen
+
+from .game import SnakeGame
+from .inputs import SwipeInput
+from .render import GridRenderer
+
+
+class StartScreen(Screen):
+    """Pantalla de bienvenida y menú de inicio."""
+    def __init__(self, info_text='', **kwargs):
+        super().__init__(**kwargs)
+
+        layout = BoxLayout(orientation='vertical', padding=50, spacing=30)
+
+        # Título
+        title_label = Label(text='🐍 SNAKE KIVY 🐍', font_size='60sp', size_hint_y=0.4)
+
+        # Botón de Inicio
+        start_button = Button(text='Iniciar Juego', font_size='40sp', size_hint_y=0.3)
+        start_button.bind(on_release=self.start_game)
+
+        # Créditos / Instrucciones
+        info_label = Label(text=info_text, font_size='20sp', size_hint_y=0.3)
+
+        layout.add_widget(title_label)
+        layout.add_widget(start_button)
+        layout.add_widget(info_label)
+
+        self.add_widget(layout)
+
+    def start_game(self, instance):
+        """Cambia a la pantalla de juego."""
+        self.manager.current = 'game'
+
+
+class GameScreen(Screen):
+    """
+    Pantalla que contiene el juego y la puntuación. Con ``fixed_size`` el
+    juego mide exactamente su cuadrícula; si no, ocupa el espacio libre.
+    """
+    def __init__(self, game, fixed_size=False, **kwargs):
+        super().__init__(**kwargs)
+
+        # Layout principal (vertical): Controles de info + Área de juego
+        self.main_layout = BoxLayout(orientation='vertical',
+                                     padding=[0, 0, 0, 20] if fixed_size else 0)
+
+        # 1. Barra de Puntuación
+        self.score_label = Label(text='Puntos: 0', size_hint_y=0.1, font_size='30sp')
+        self.main_layout.add_widget(self.score_label)
+
+        # 2. Área de Juego (SnakeGame)
+        self.game_widget = game
+        if fixed_size:
+            game.size_hint = (None, None)
+            game.size = game.grid_size
+        else:
+            game.size_hint_y = 0.9
+        game.bind(score=lambda widget, score: self.update_score(score))
+        self.main_layout.add_widget(game)
+
+        self.add_widget(self.main_layout)
+
+    def on_enter(self, *args):
+        """Se llama cuando la pantalla se vuelve visible (al iniciar el juego)."""
+        self.game_widget.start()
+
+    def on_pre_leave(self, *args):
+        """Al salir de la pantalla el juego deja de actualizarse."""
+        self.game_widget.stop()
+
+    def update_score(self, score):
+        """Actualiza el texto de la puntuación."""
+        self.score_label.text = f'Puntos: {score}'
+
+
+class GameOverScreen(Screen):
+    """Pantalla que se muestra al perder."""
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.layout = BoxLayout(orientation='vertical', padding=50, spacing=30)
+
+        self.message_label = Label(text='¡Juego Terminado!', font_size='60sp', size_hint_y=0.4)
+        self.final_score_label = Label(text='Puntuación Final: 0', font_size='40sp', size_hint_y=0.3)
+
+        # Botón para volver al menú
+        restart_button = Button(text='Volver al Menú', font_size='40sp', size_hint_y=0.3)
+        restart_button.bind(on_release=self.go_to_start)
+
+        self.layout.add_widget(self.message_label)
+        self.layout.add_widget(self.final_score_label)
+        self.layout.add_widget(restart_button)
+        self.add_widget(self.layout)
+
+    def update_score_display(self, score):
+        """Actualiza la puntuación final antes de mostrar la pantalla."""
+        self.final_score_label.text = f'Puntuación Final: {score}'
+
+    def go_to_start(self, instance):
+        """Vuelve a la pantalla de inicio."""
+        self.manager.current = 'start'
+
+
+class SnakeGameApp(App):
+    """
+    Clase principal que construye el ScreenManager para gestionar las pantallas.
+    Las variantes cambian los atributos de configuración y create_inputs().
+    """
+    # Celdas a lo ancho y a lo alto
+    grid = (40, 40)
+    # Tamaño de cada celda (en píxeles)
+    cell_size = 20
+    # Pasos del juego por segundo
+    tick_rate = 10
+    # True: el juego mide lo que su cuadrícula y la ventana se ajusta a él
+    fixed_size = False
+    info_text = 'Instrucciones: Desliza el dedo (swipe) para cambiar de dirección.'
+
+    def create_inputs(self):
+        return [SwipeInput()]
+
+    def create_renderer(self):
+        return GridRenderer()
+
+    def game_options(self):
+        """Parámetros con los que se crea el SnakeGame de esta variante."""
+        return {
+            'grid': self.grid,
+            'cell_size': self.cell_size,
+            'tick_rate': self.tick_rate,
+            'inputs': self.create_inputs(),
+            'renderer': self.create_renderer(),
+        }
+
+    def build(self):
+        self.title = 'Kivy Snake Game'
+        if self.fixed_size:
+            # Establece el tamaño de la ventana para que coincida con la grilla
+            from kivy.core.window import Window
+            Window.size = (self.grid[0] * self.cell_size, self.grid[1] * self.cell_size + 50)
+
+        # Creamos el gestor de pantallas
+        sm = ScreenManager()
+
+        # Creamos las pantallas
+        start_screen = StartScreen(info_text=self.info_text, name='start')
+        game_screen = GameScreen(SnakeGame(**self.game_options()), fixed_size=self.fixed_size,
+                                 name='game')
+        game_over_screen = GameOverScreen(name='game_over')
+
+        # Las añadimos al gestor
+        sm.add_widget(start_screen)
+        sm.add_widget(game_screen)
+        sm.add_widget(game_over_screen)
+
+        # Guardamos referencias para la transición Game Over
+        self.game_over_screen = game_over_screen
+
+        # Pantalla inicial
+        sm.current = 'start'
+        return sm
+
+    def show_game_over(self, score):
+        """Función llamada desde el SnakeGame para finalizar el juego."""
+        self.game_over_screen.update_score_display(score)
+        self.root.current = 'game_over'
@@ -0,0 +1,221 @@
+'''
+Índice espacial de segmentos para la goma y la selección de EjemploPintar.
+
+Recorrer todos los trazos en cada evento táctil no escala con miles de
+trazos. SegmentGrid reparte los segmentos de cada trazo en una rejilla
+uniforme de celdas; una consulta solo mira las celdas que toca el círculo
+buscado y comprueba la distancia exacta a esos segmentos.
+
+Las claves de los trazos son cualquier objeto hasheable (DrawingCanvas usa
+el propio trazo). Los segmentos y la caja de cada trazo se pueden ir
+añadiendo de uno en uno mientras se dibuja, y el último segmento se puede
+alargar (replace_last) sin añadir otro cada vez que se mueve su final.
+'''
+
+import math
+from itertools import chain
+
+# Lado de cada celda en píxeles
+CELL_SIZE = 32
+
+
+def segment_distance2(px, py, x1, y1, x2, y2):
+    """Distancia al cuadrado del punto (px, py) al segmento (x1, y1)-(x2, y2)."""
+    dx = x2 - x1
+    dy = y2 - y1
+    len2 = dx * dx + dy * dy
+    if len2:
+        t = ((px - x1) * dx + (py - y1) * dy) / len2
+        if t < 0:
+            t = 0
+        elif t > 1:
+            t = 1
+        x1 += t * dx
+        y1 += t * dy
+    ex = px - x1
+    ey = py - y1
+    return ex * ex + ey * ey
+
+
+def _cells_outside(a, b):
+    """Celdas del rango ``a`` que no están en el rango ``b`` (rangos (cx0, cx1, cy0, cy1) inclusivos)."""
+    ax0, ax1, ay0, ay1 = a
+    bx0, bx1, by0, by1 = b
+    # Columnas fuera de b: enteras
+    for cx in chain(range(ax0, min(ax1, bx0 - 1) + 1), range(max(ax0, bx1 + 1), ax1 + 1)):
+        for cy in range(ay0, ay1 + 1):
+            yield cx, cy
+    # Columnas compartidas: solo las filas fuera de b
+    rows = [*range(ay0, min(ay1, by0 - 1) + 1), *range(max(ay0, by1 + 1), ay1 + 1)]
+    if rows:
+        for cx in range(max(ax0, bx0), min(ax1, bx1) + 1):
+            for cy in rows:
+                yield cx, cy
+
+
+class SegmentGrid:
+    """Rejilla uniforme de segmentos agrupados por trazo."""
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        # (cx, cy) -> lista de (clave, x1, y1, x2, y2, radio)
+        self._cells = {}
+        # clave -> conjunto de celdas donde tiene segmentos
+        self._cells_of = {}
+        # clave -> [xmin, ymin, xmax, ymax]
+        self._boxes = {}
+        # clave -> número de segmentos
+        self._counts = {}
+        # clave -> (entrada, rango de celdas) del último segmento añadido
+        self._last = {}
+        self.segments = 0
+
+    def __contains__(self, key):
+        return key in self._boxes
+
+    def __len__(self):
+        """Número de trazos indexados."""
+        return len(self._boxes)
+
+    def clear(self):
+        self._cells.clear()
+        self._cells_of.clear()
+        self._boxes.clear()
+        self._counts.clear()
+        self._last.clear()
+        self.segments = 0
+
+    def bbox(self, key):
+        """Caja (xmin, ymin, xmax, ymax) de un trazo, incluido su grosor."""
+        return tuple(self._boxes[key])
+
+    def _grow_box(self, key, xmin, ymin, xmax, ymax):
+        box = self._boxes.get(key)
+        if box is None:
+            self._boxes[key] = [xmin, ymin, xmax, ymax]
+            self._counts[key] = 0
+            self._cells_of[key] = set()
+            return
+        if xmin < box[0]:
+            box[0] = xmin
+        if ymin < box[1]:
+            box[1] = ymin
+        if xmax > box[2]:
+            box[2] = xmax
+        if ymax > box[3]:
+            box[3] = ymax
+
+    def _cell_range(self, xmin, ymin, xmax, ymax):
+        size = self.cell_size
+        return (math.floor(xmin / size), math.floor(xmax / size),
+                math.floor(ymin / size), math.floor(ymax / size))
+
+    def add_segment(self, key, x1, y1, x2, y2, radius=0.0):
+        """Añade un segmento de ``key``; ``radius`` es medio grosor del trazo."""
+        xmin = min(x1, x2) - radius
+        ymin = min(y1, y2) - radius
+        xmax = max(x1, x2) + radius
+        ymax = max(y1, y2) + radius
+        self._grow_box(key, xmin, ymin, xmax, ymax)
+        cells_of = self._cells_of[key]
+
+        # Es una lista para que replace_last la pueda cambiar en su sitio
+        entry = [key, x1, y1, x2, y2, radius]
+        cell_range = self._cell_range(xmin, ymin, xmax, ymax)
+        cx0, cx1, cy0, cy1 = cell_range
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                cell = (cx, cy)
+                bucket = cells.get(cell)
+                if bucket is None:
+                    cells[cell] = [entry]
+                else:
+                    bucket.append(entry)
+                cells_of.add(cell)
+        self._last[key] = (entry, cell_range)
+        self._counts[key] += 1
+        self.segments += 1
+
+    def replace_last(self, key, x2, y2):
+        """
+        Mueve el final del último segmento de ``key`` a (x2, y2), como
+        StrokeBuffer.replace_last. Solo se tocan las celdas que entran o
+        salen del segmento; la caja del trazo crece pero no se encoge.
+        """
+        entry, old_range = self._last[key]
+        _, x1, y1, _, _, radius = entry
+        entry[3] = x2
+        entry[4] = y2
+        xmin = min(x1, x2) - radius
+        ymin = min(y1, y2) - radius
+        xmax = max(x1, x2) + radius
+        ymax = max(y1, y2) + radius
+        self._grow_box(key, xmin, ymin, xmax, ymax)
+        new_range = self._cell_range(xmin, ymin, xmax, ymax)
+        if new_range == old_range:
+            return
+
+        cells = self._cells
+        cells_of = self._cells_of[key]
+        for cell in _cells_outside(new_range, old_range):
+            bucket = cells.get(cell)
+            if bucket is None:
+                cells[cell] = [entry]
+            else:
+                bucket.append(entry)
+            cells_of.add(cell)
+        # En las celdas que deja puede haber otros segmentos del trazo, así
+        # que la celda se queda en cells_of (remove() lo tiene en cuenta)
+        for cell in _cells_outside(old_range, new_range):
+            kept = [other for other in cells[cell] if other is not entry]
+            if kept:
+                cells[cell] = kept
+            else:
+                del cells[cell]
+        self._last[key] = (entry, new_range)
+
+    def add_points(self, key, points, radius=0.0):
+        """Añade todos los segmentos de unas coordenadas planas (x0, y0, x1...)."""
+        if len(points) == 2:
+            # Un trazo de un solo punto también se puede tocar
+            self.add_segment(key, points[0], points[1], points[0], points[1], radius)
+        for i in range(0, len(points) - 3, 2):
+            self.add_segment(key, points[i], points[i + 1], points[i + 2], points[i + 3], radius)
+
+    def remove(self, key):
+        """Quita todos los segmentos de ``key`` (si estaba indexado)."""
+        cells_of = self._cells_of.pop(key, None)
+        if cells_of is None:
+            return
+        del self._boxes[key]
+        self._last.pop(key, None)
+        self.segments -= self._counts.pop(key)
+        cells = self._cells
+        for cell in cells_of:
+            bucket = cells.get(cell)
+            if bucket is None:
+                continue
+            kept = [entry for entry in bucket if entry[0] is not key]
+            if kept:
+                cells[cell] = kept
+            else:
+                del cells[cell]
+
+    def query(self, x, y, radius=0.0):
+        """Claves de los trazos que pasan a menos de ``radius`` de (x, y)."""
+        size = self.cell_size
+        cells = self._cells
+        found = set()
+        for cx in range(math.floor((x - radius) / size), math.floor((x + radius) / size) + 1):
+            for cy in range(math.floor((y - radius) / size), math.floor((y + radius) / size) + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for key, x1, y1, x2, y2, r in bucket:
+                    if key in found:
+                        continue
+                    reach = radius + r
+                    if segment_distance2(x, y, x1, y1, x2, y2) <= reach * reach:
+                        found.add(key)
+        return found
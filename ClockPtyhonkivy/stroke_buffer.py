@@ -0,0 +1,91 @@
+'''
+Buffer de puntos para los trazos de EjemploPintar.
+
+Hacer ``line.points += [x, y]`` en cada movimiento copia la lista completa
+del trazo y la vuelve a subir, así que un trazo largo cuesta O(n²).
+StrokeBuffer guarda los puntos en un ``array('f')`` plano (x0, y0, x1, y1...)
+donde añadir es O(1) amortizado, y los reparte en trozos de tamaño acotado:
+cada trozo se dibuja con su propia instrucción ``Line``, de modo que en cada
+evento solo se copia el trozo abierto y no el trazo entero.
+'''
+
+from array import array
+
+# Número máximo de puntos (pares x, y) por instrucción Line
+CHUNK_POINTS = 256
+
+
+class StrokeBuffer:
+    """Puntos de un trazo, con inserción O(1) y volcado por trozos."""
+
+    def __init__(self, chunk_points=CHUNK_POINTS):
+        if chunk_points < 2:
+            raise ValueError('chunk_points debe ser al menos 2')
+        self.chunk_points = chunk_points
+        # Coordenadas planas: x0, y0, x1, y1, ...
+        self.points = array('f')
+        # Índice (en floats) donde empieza el trozo abierto
+        self._chunk_start = 0
+
+    def __len__(self):
+        """Número de puntos del trazo."""
+        return len(self.points) // 2
+
+    def append(self, x, y):
+        """
+        Añade un punto al trazo.
+
+        Devuelve True si el trozo abierto estaba lleno y se ha empezado uno
+        nuevo; en ese caso hay que crear otra instrucción Line para él.
+        """
+        points = self.points
+        started = len(points) - self._chunk_start >= self.chunk_points * 2
+        if started:
+            # El nuevo trozo repite el último punto del anterior para que
+            # la línea se vea continua
+            self._chunk_start = len(points) - 2
+        points.append(x)
+        points.append(y)
+        return started
+
+    def replace_last(self, x, y):
+        """Mueve el último punto del trazo (siempre pertenece al trozo abierto)."""
+        self.points[-2] = x
+        self.points[-1] = y
+
+    @property
+    def chunk_count(self):
+        """Número de trozos (el último es el abierto)."""
+        return self._chunk_start // (self.chunk_points * 2 - 2) + 1
+
+    def chunk(self, index):
+        """Coordenadas del trozo ``index``."""
+        start = index * (self.chunk_points * 2 - 2)
+        return self.points[start:start + self.chunk_points * 2]
+
+    def current_chunk(self):
+        """Coordenadas del trozo abierto (como mucho ``chunk_points`` puntos)."""
+        return self.points[self._chunk_start:]
+
+    def chunks(self):
+        """Itera sobre todos los trozos, en el mismo corte que usa append()."""
+        return iter_chunks(self.points, self.chunk_points)
+
+
+def iter_chunks(points, chunk_points=CHUNK_POINTS):
+    """Corta coordenadas planas en trozos de ``chunk_points`` puntos que comparten extremo."""
+    size = chunk_points * 2
+    step = size - 2
+    for start in range(0, max(len(points) - 2, 1), step):
+        yield points[start:start + size]
+
+
+class Stroke:
+    """Trazo terminado: coordenadas planas, color RGBA y grosor."""
+
+    __slots__ = ('points', 'color', 'width')
+
+    def __init__(self, points, color, width):
+        self.points = points
+        self.color = tuple(color)
+        self.width = width
@@ -0,0 +1,155 @@
+'''
+Simplificación de trazos para EjemploPintar.
+
+Un digitalizador rápido manda cientos de muestras por segundo y cada una
+acaba como vértice de la línea. Aquí hay dos etapas:
+
+* StreamSimplifier: mientras se dibuja, descarta las muestras demasiado
+  cercanas al último vértice y, si el trazo sigue casi recto, mueve el
+  último vértice en vez de añadir otro.
+* rdp(): al levantar el dedo, pasada de Ramer-Douglas-Peucker sobre el trazo
+  completo con la misma tolerancia.
+
+SimplifyStats acumula cuántos vértices se ahorran y cuánto se tarda en
+redibujar.
+'''
+
+import math
+from array import array
+
+# Resultados de StreamSimplifier.add()
+SKIP = 0     # la muestra se descarta
+APPEND = 1   # la muestra es un vértice nuevo
+REPLACE = 2  # la muestra sustituye al último vértice
+
+
+class StreamSimplifier:
+    """
+    Filtro por distancia y ángulo que se aplica punto a punto.
+
+    ``tolerance`` es la distancia mínima (en píxeles) entre vértices y
+    ``angle`` el giro mínimo (en grados) para conservar un vértice. Con
+    ``tolerance`` 0 no se simplifica: todas las muestras son vértices, pero
+    se siguen contando en ``raw_points``.
+    """
+
+    def __init__(self, tolerance=1.0, angle=5.0):
+        self.enabled = tolerance > 0
+        self.min_dist2 = tolerance * tolerance
+        self.cos2 = math.cos(math.radians(angle)) ** 2
+        self.raw_points = 0
+        self._prev = None
+        self._last = None
+
+    def start(self, x, y):
+        """Empieza un trazo nuevo en (x, y)."""
+        self.raw_points = 1
+        self._prev = None
+        self._last = (x, y)
+
+    def add(self, x, y):
+        """Clasifica una muestra: devuelve SKIP, APPEND o REPLACE."""
+        self.raw_points += 1
+        if not self.enabled:
+            return APPEND
+        lx, ly = self._last
+        dx = x - lx
+        dy = y - ly
+        d2 = dx * dx + dy * dy
+        if d2 < self.min_dist2:
+            return SKIP
+
+        if self._prev is not None:
+            # Si el segmento nuevo sigue la dirección del anterior (giro
+            # menor que el umbral), basta con alargar el último segmento
+            px = lx - self._prev[0]
+            py = ly - self._prev[1]
+            dot = px * dx + py * dy
+            if dot > 0 and dot * dot >= self.cos2 * (px * px + py * py) * d2:
+                self._last = (x, y)
+                return REPLACE
+
+        self._prev = self._last
+        self._last = (x, y)
+        return APPEND
+
+
+def rdp(points, tolerance):
+    """
+    Ramer-Douglas-Peucker sobre coordenadas planas (x0, y0, x1, y1...).
+
+    Devuelve un ``array('f')`` con los vértices que se alejan más de
+    ``tolerance`` píxeles de la recta que los sustituiría. Es iterativo para
+    no depender del límite de recursión en trazos largos.
+    """
+    n = len(points) // 2
+    if n < 3 or tolerance <= 0:
+        return array('f', points)
+
+    tol2 = tolerance * tolerance
+    keep = bytearray(n)
+    keep[0] = keep[n - 1] = 1
+    stack = [(0, n - 1)]
+    while stack:
+        first, last = stack.pop()
+        x1 = points[2 * first]
+        y1 = points[2 * first + 1]
+        dx = points[2 * last] - x1
+        dy = points[2 * last + 1] - y1
+        len2 = dx * dx + dy * dy
+
+        max_d2 = 0.0
+        index = first
+        for i in range(first + 1, last):
+            px = points[2 * i] - x1
+            py = points[2 * i + 1] - y1
+            if len2:
+                cross = px * dy - py * dx
+                d2 = cross * cross / len2
+            else:
+                # Extremos iguales (trazo cerrado): distancia al punto
+                d2 = px * px + py * py
+            if d2 > max_d2:
+                max_d2 = d2
+                index = i
+
+        if max_d2 > tol2:
+            keep[index] = 1
+            stack.append((first, index))
+            stack.append((index, last))
+
+    result = array('f')
+    for i in range(n):
+        if keep[i]:
+            result.append(points[2 * i])
+            result.append(points[2 * i + 1])
+    return result
+
+
+class SimplifyStats:
+    """Estadísticas acumuladas de la simplificación."""
+
+    def __init__(self):
+        self.strokes = 0
+        self.raw_points = 0       # muestras recibidas
+        self.stream_points = 0    # vértices tras el filtro en línea
+        self.final_points = 0     # vértices tras RDP
+        self.redraw_time = 0.0    # segundos actualizando instrucciones Line
+
+    def add_stroke(self, raw_points, stream_points, final_points):
+        self.strokes += 1
+        self.raw_points += raw_points
+        self.stream_points += stream_points
+        self.final_points += final_points
+
+    @property
+    def reduction(self):
+        """Fracción de vértices eliminados (0.0 - 1.0)."""
+        if not self.raw_points:
+            return 0.0
+        return 1.0 - self.final_points / self.raw_points
+
+    def summary(self):
+        return (f'{self.strokes} trazos, {self.raw_points} muestras -> '
+                f'{self.stream_points} en línea -> {self.final_points} tras RDP '
+                f'({self.reduction:.0%} menos), redibujado {self.redraw_time * 1000:.1f} ms')
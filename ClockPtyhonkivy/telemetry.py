@@ -0,0 +1,199 @@
+'''
+Contadores y temporizadores de las demos, exportados a un fichero.
+
+Se activa con la variable de entorno TELEMETRY_FILE antes de arrancar la
+app. Si el fichero termina en .json se escribe en JSON; si no, en el formato
+de texto de Prometheus (el que lee el textfile collector de node_exporter):
+
+    TELEMETRY_FILE=/tmp/snake.prom python snake.py
+
+Los datos se acumulan en memoria y un hilo en segundo plano los vuelca cada
+TELEMETRY_INTERVAL segundos (10 por defecto) y al salir. El fichero se
+escribe entero y se renombra, así quien lo lea nunca ve uno a medias. Si no
+se puede escribir se avisa una vez en el log y se sigue intentando.
+
+Sin TELEMETRY_FILE, ``timed`` devuelve la función sin tocar e ``increment``
+no hace nada: los puntos de medida no cuestan nada.
+'''
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+TELEMETRY_FILE = os.environ.get('TELEMETRY_FILE')
+ENABLED = bool(TELEMETRY_FILE)
+# Segundos entre volcados
+INTERVAL = float(os.environ.get('TELEMETRY_INTERVAL', 10))
+# Muestras recientes de cada temporizador sobre las que se calculan los percentiles
+MAX_SAMPLES = 4096
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+class Timer:
+    """Duraciones de una operación: total acumulado y las últimas muestras."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def observe(self, seconds):
+        with _lock:
+            self.count += 1
+            self.total += seconds
+            self.samples.append(seconds)
+
+    def summary(self):
+        with _lock:
+            count, total, samples = self.count, self.total, sorted(self.samples)
+        result = {'count': count, 'sum': total}
+        if samples:
+            for q in QUANTILES:
+                result[f'p{round(q * 100)}'] = samples[min(len(samples) - 1, int(q * len(samples)))]
+            result['max'] = samples[-1]
+        return result
+
+
+_lock = threading.Lock()
+_timers = {}
+_counters = {}
+_flusher = None
+# Ya se ha avisado de que no se puede escribir el fichero
+_flush_failed = False
+
+
+def timer(name):
+    """Temporizador ``name`` (se crea la primera vez)."""
+    found = _timers.get(name)
+    if found is None:
+        found = _timers.setdefault(name, Timer())
+        _start_flusher()
+    return found
+
+
+if ENABLED:
+    def timed(name):
+        """Decorador: mide cada llamada con el temporizador ``name``."""
+        def decorator(func):
+            observe = timer(name).observe
+            perf_counter = time.perf_counter
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    observe(perf_counter() - start)
+
+            return wrapper
+        return decorator
+
+    def increment(name, value=1):
+        """Suma ``value`` al contador ``name``."""
+        with _lock:
+            _counters[name] = _counters.get(name, 0) + value
+        _start_flusher()
+else:
+    def timed(name):
+        """Desactivado: devuelve la función tal cual."""
+        return lambda func: func
+
+    def increment(name, value=1):
+        """Desactivado: no hace nada."""
+
+
+def snapshot():
+    """Estado actual de todos los temporizadores y contadores."""
+    with _lock:
+        counters = dict(_counters)
+        timers = list(_timers.items())
+    return {
+        'timestamp': time.time(),
+        'timers': {name: t.summary() for name, t in timers},
+        'counters': counters,
+    }
+
+
+def format_prometheus(data):
+    """Texto en el formato de exposición de Prometheus."""
+    lines = []
+    for name, summary in sorted(data['timers'].items()):
+        metric = f'{name}_seconds'
+        lines.append(f'# TYPE {metric} summary')
+        for q in QUANTILES:
+            key = f'p{round(q * 100)}'
+            if key in summary:
+                lines.append(f'{metric}{{quantile="{q:g}"}} {summary[key]:.9f}')
+        lines.append(f'{metric}_sum {summary["sum"]:.9f}')
+        lines.append(f'{metric}_count {summary["count"]}')
+    for name, value in sorted(data['counters'].items()):
+        lines.append(f'# TYPE {name}_total counter')
+        lines.append(f'{name}_total {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def flush(path=None):
+    """Escribe el estado actual en ``path`` (por defecto TELEMETRY_FILE)."""
+    path = path or TELEMETRY_FILE
+    if not path:
+        return
+    data = snapshot()
+    if path.endswith('.json'):
+        text = json.dumps(data, indent=2)
+    else:
+        text = format_prometheus(data)
+    tmp = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        # No dejar el temporal a medias (disco lleno, sin permisos...)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _safe_flush():
+    """flush() desde el hilo o al salir: un fallo se avisa una vez y no se propaga."""
+    global _flush_failed
+    try:
+        flush()
+    except OSError as error:
+        if not _flush_failed:
+            _flush_failed = True
+            from kivy.logger import Logger
+            Logger.warning('Telemetry: no se puede escribir %s: %s', TELEMETRY_FILE, error)
+    else:
+        _flush_failed = False
+
+
+def _flush_loop(stop):
+    while not stop.wait(INTERVAL):
+        _safe_flush()
+
+
+def _start_flusher():
+    global _flusher
+    if _flusher is not None or not ENABLED:
+        return
+    with _lock:
+        if _flusher is not None:
+            return
+        stop = threading.Event()
+        _flusher = threading.Thread(target=_flush_loop, args=(stop,),
+                                    name='telemetry-flush', daemon=True)
+        _flusher.start()
+
+    def shutdown():
+        stop.set()
+        _safe_flush()
+
+    atexit.register(shutdown)
@@ -0,0 +1,161 @@
+'''
+Formato .kdrw de drawing_file.py: ida y vuelta (cuantización, límites,
+bloques) y ficheros vacíos, truncados o dañados.
+
+    python -m pytest test_drawing_file.py
+'''
+
+import os
+import struct
+import tempfile
+import unittest
+import zlib
+from array import array
+from unittest import mock
+
+import drawing_file
+from drawing_file import DrawingFileError
+from stroke_buffer import Stroke
+
+
+def stroke(points, color=(0, 1, 0, 1), width=3):
+    return Stroke(array('f', points), color, width)
+
+
+class DrawingFileTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'dibujo.kdrw')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, data):
+        with open(self.path, 'wb') as f:
+            f.write(data)
+
+    def read(self):
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def assertLoadFails(self):
+        with self.assertRaises(DrawingFileError):
+            drawing_file.load(self.path)
+
+    # Ida y vuelta
+
+    def test_round_trip(self):
+        strokes = [stroke([10, 20, 30.5, 40, 29, 41.5], (1, 0.5, 0, 1), 2.5),
+                   stroke([0, 0], (0, 0, 1, 0.25), 1)]
+        drawing_file.save(self.path, strokes)
+        loaded = drawing_file.load(self.path)
+        self.assertEqual(len(loaded), 2)
+        for original, copy in zip(strokes, loaded):
+            self.assertEqual(list(copy.points), list(original.points))
+            self.assertEqual(copy.width, original.width)
+            for a, b in zip(copy.color, original.color):
+                self.assertAlmostEqual(a, b, delta=1 / 255)
+        self.assertEqual(drawing_file.read_header(self.path), (2, 4))
+
+    def test_empty_drawing(self):
+        drawing_file.save(self.path, [])
+        self.assertEqual(drawing_file.load(self.path), [])
+        self.assertEqual(drawing_file.read_header(self.path), (0, 0))
+
+    def test_quantised_to_half_pixel(self):
+        drawing_file.save(self.path, [stroke([10.2, 10.3, 10.8, -3.7])])
+        points = drawing_file.load(self.path)[0].points
+        self.assertEqual(list(points), [10.0, 10.5, 11.0, -3.5])
+
+    def test_clamped_to_int16_range(self):
+        # Fuera de ±8192 px la coordenada cuantizada se recorta a ±16384
+        drawing_file.save(self.path, [stroke([-20000, 0, 20000, 9000, 0, -8192])])
+        points = drawing_file.load(self.path)[0].points
+        self.assertEqual(list(points), [-8192, 0, 8191.5, 8191.5, 0, -8192])
+
+    def test_long_jumps_do_not_overflow(self):
+        # Diferencias de casi 32768 pasos entre puntos seguidos
+        points = [-8000, 8000, 8000, -8000, -8000, 8000]
+        drawing_file.save(self.path, [stroke(points)])
+        self.assertEqual(list(drawing_file.load(self.path)[0].points), points)
+
+    def test_several_blocks(self):
+        strokes = [stroke([i, i, i + 1, i + 2]) for i in range(50)]
+        with mock.patch.object(drawing_file, 'BLOCK_BYTES', 100):
+            drawing_file.save(self.path, strokes)
+        blocks = list(drawing_file.iter_blocks(self.path))
+        self.assertGreater(len(blocks), 1)
+        loaded = [s for block in blocks for s in block]
+        self.assertEqual([list(s.points) for s in loaded], [list(s.points) for s in strokes])
+
+    def test_little_endian_on_disk(self):
+        drawing_file.save(self.path, [stroke([1, 2, 4, 8], (1, 0, 0, 1), 3)])
+        data = self.read()
+        offset = struct.calcsize('<4sBBHII')
+        packed, _, _ = struct.unpack_from('<III', data, offset)
+        offset += struct.calcsize('<III')
+        block = zlib.decompress(data[offset:offset + packed])
+        r, g, b, a, width, n, x0, y0, dx, dy = struct.unpack('<4BHI4h', block)
+        self.assertEqual((r, g, b, a, width, n), (255, 0, 0, 255, 300, 2))
+        self.assertEqual((x0, y0, dx, dy), (2, 4, 6, 12))
+
+    def test_save_replaces_atomically(self):
+        drawing_file.save(self.path, [stroke([1, 1, 2, 2])])
+        before = self.read()
+        with self.assertRaises(TypeError):
+            drawing_file.save(self.path, [stroke([3, 3]), Stroke(None, (0, 0, 0, 1), 1)])
+        self.assertEqual(self.read(), before)
+        self.assertEqual(os.listdir(self.tmp.name), ['dibujo.kdrw'])
+
+    # Ficheros no válidos
+
+    def test_empty_file(self):
+        self.write(b'')
+        with self.assertRaises(DrawingFileError):
+            drawing_file.read_header(self.path)
+        self.assertLoadFails()
+
+    def test_not_a_drawing(self):
+        self.write(b'PNG\0' + bytes(40))
+        with self.assertRaises(DrawingFileError):
+            drawing_file.read_header(self.path)
+        self.assertLoadFails()
+
+    def test_unsupported_version(self):
+        drawing_file.save(self.path, [stroke([1, 1])])
+        data = bytearray(self.read())
+        data[4] = drawing_file.VERSION + 1
+        self.write(data)
+        with self.assertRaises(DrawingFileError):
+            drawing_file.read_header(self.path)
+
+    def test_truncated_files(self):
+        drawing_file.save(self.path, [stroke([i, i]) for i in range(20)])
+        data = self.read()
+        header = struct.calcsize('<4sBBHII')
+        # Cortes dentro de la cabecera del bloque y dentro de sus datos
+        for size in (header + 5, header + 14, len(data) - 1):
+            with self.subTest(size=size):
+                self.write(data[:size])
+                self.assertLoadFails()
+
+    def test_corrupt_block(self):
+        drawing_file.save(self.path, [stroke([i, i]) for i in range(20)])
+        data = bytearray(self.read())
+        data[-5] ^= 0xFF
+        self.write(data)
+        self.assertLoadFails()
+
+    def test_block_with_missing_strokes(self):
+        # El bloque dice tener dos trazos pero solo trae uno
+        payload = struct.pack('<4BHI2h', 0, 255, 0, 255, 300, 1, 2, 2)
+        packed = zlib.compress(payload)
+        self.write(struct.pack('<4sBBHII', drawing_file.MAGIC, drawing_file.VERSION,
+                               drawing_file.SCALE, 0, 2, 2)
+                   + struct.pack('<III', len(packed), len(payload), 2) + packed)
+        self.assertLoadFails()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+'''
+ExpressionBuffer from expression_buffer.py: editing at the cursor, paste
+filtering, results and errors.
+
+    python -m pytest test_expression_buffer.py
+'''
+
+import unittest
+
+from expression_buffer import ExpressionBuffer, tokenize
+
+
+def typed(text):
+    buffer = ExpressionBuffer()
+    buffer.insert(text)
+    return buffer
+
+
+class ExpressionBufferTest(unittest.TestCase):
+
+    def test_tokenize_drops_junk(self):
+        self.assertEqual(tokenize(' 12 + (3.5)x\n'), ['1', '2', '+', '(', '3', '.', '5', ')'])
+        self.assertEqual(tokenize('abc'), [])
+
+    def test_paste_inserts_at_cursor(self):
+        buffer = typed('1+2')
+        buffer.move_cursor(-2)
+        self.assertEqual(buffer.insert('3 4*'), 3)
+        self.assertEqual(buffer.text, '134*+2')
+        self.assertEqual(buffer.cursor_index, 4)
+
+    def test_backspace(self):
+        buffer = typed('12')
+        buffer.move_cursor(-1)
+        buffer.backspace()
+        self.assertEqual((buffer.text, buffer.cursor_index), ('2', 0))
+        # At the start there is nothing to delete
+        buffer.backspace()
+        self.assertEqual(buffer.text, '2')
+
+    def test_cursor_is_clamped(self):
+        buffer = typed('123')
+        buffer.move_cursor(-10)
+        self.assertEqual(buffer.cursor_index, 0)
+        buffer.move_cursor(10)
+        self.assertEqual(buffer.cursor_index, 3)
+        buffer.move_cursor_to(0)
+        self.assertEqual(buffer.cursor, 0)
+        self.assertFalse(buffer.at_end)
+        buffer.move_cursor_to(-1)
+        self.assertEqual(buffer.cursor, 3)
+        self.assertTrue(buffer.at_end)
+
+    def test_result_is_a_single_token(self):
+        buffer = typed('2*21')
+        buffer.set_result('42.5')
+        self.assertEqual((buffer.text, buffer.cursor_index), ('42.5', 4))
+        buffer.backspace()
+        self.assertEqual(buffer.text, '')
+
+    def test_error_until_next_edit(self):
+        buffer = typed('1/')
+        buffer.set_error()
+        self.assertEqual((buffer.text, buffer.cursor_index), ('Error', 5))
+        self.assertTrue(buffer.at_end)
+        buffer.insert('7')
+        self.assertEqual(buffer.text, '7')
+
+        # Even a key that adds nothing clears the error
+        buffer.set_error('Overflow')
+        self.assertEqual(buffer.insert('x'), 0)
+        self.assertEqual(buffer.text, '')
+
+    def test_version_tracks_changes(self):
+        buffer = typed('1')
+        version = buffer.version
+        buffer.insert('?')
+        buffer.move_cursor(1)
+        self.assertEqual(buffer.version, version)
+        buffer.move_cursor(-1)
+        self.assertGreater(buffer.version, version)
+        version = buffer.version
+        buffer.clear()
+        self.assertGreater(buffer.version, version)
+        self.assertEqual((buffer.text, buffer.cursor_index), ('', 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
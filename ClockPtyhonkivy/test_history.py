@@ -0,0 +1,135 @@
+'''
+Deshacer / rehacer de DrawingCanvas: tras cargar un dibujo tiene que volver
+al dibujo cargado, no al lienzo vacío, y deshacer varios borrados seguidos
+pinta la capa una sola vez.
+
+    python -m pytest test_history.py
+'''
+
+import os
+import tempfile
+import unittest
+from array import array
+
+from history import History, AddStroke
+
+
+class ListHistory:
+    """Estado mínimo para History: una lista de trazos."""
+
+    def __init__(self):
+        self.strokes = []
+        self.history = History(self.apply, self.snapshot, self.restore, interval=20)
+
+    def apply(self, command):
+        self.strokes.append(command.stroke)
+
+    def snapshot(self):
+        return tuple(self.strokes), len(self.strokes)
+
+    def restore(self, state):
+        self.strokes = list(state or ())
+
+
+class HistoryBaseTest(unittest.TestCase):
+
+    def test_undo_returns_to_loaded_state(self):
+        state = ListHistory()
+        state.history.clear()
+        # Trazos cargados fuera del historial
+        state.strokes.extend(['a', 'b', 'c'])
+        state.history.checkpoint()
+
+        state.history.push(AddStroke('d'))
+        self.assertTrue(state.history.undo())
+        self.assertEqual(state.strokes, ['a', 'b', 'c'])
+        self.assertFalse(state.history.undo())
+        self.assertTrue(state.history.redo())
+        self.assertEqual(state.strokes, ['a', 'b', 'c', 'd'])
+
+
+class DrawingCanvasTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from frame_profiler import headless_environment
+
+        for name, value in headless_environment().items():
+            os.environ.setdefault(name, value)
+        try:
+            from kivy.base import EventLoop
+            EventLoop.ensure_window()
+        except Exception as error:  # sin GL no hay Fbo
+            raise unittest.SkipTest(f'no se puede abrir una ventana: {error}')
+        if EventLoop.window is None:
+            raise unittest.SkipTest('no se puede abrir una ventana')
+
+    def setUp(self):
+        import drawing_file
+        from stroke_buffer import Stroke
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'dibujo.kdrw')
+        strokes = [Stroke(array('f', [5, 10 + 10 * i, 60, 10 + 10 * i]), (0, 1, 0, 1), 3)
+                   for i in range(3)]
+        drawing_file.save(self.path, strokes)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _canvas(self):
+        from EjemploPintar import DrawingCanvas
+        return DrawingCanvas(size=(64, 64))
+
+    def _stroke(self):
+        from stroke_buffer import Stroke
+        return Stroke(array('f', [10, 5, 10, 60]), (1, 0, 0, 1), 3)
+
+    def test_load_add_undo(self):
+        canvas = self._canvas()
+        canvas.load_drawing(self.path)
+        while canvas._loader is not None:
+            canvas._load_block(0)
+        canvas.add_stroke(self._stroke())
+        self.assertEqual(len(canvas.strokes), 4)
+        self.assertTrue(canvas.undo())
+        self.assertEqual(len(canvas.strokes), 3)
+        self.assertTrue(canvas.redo())
+        self.assertEqual(len(canvas.strokes), 4)
+
+    def test_add_while_loading(self):
+        canvas = self._canvas()
+        canvas.load_drawing(self.path)
+        # Sin dejar que el Clock cargue nada: el historial espera a la carga
+        canvas.add_stroke(self._stroke())
+        self.assertEqual(len(canvas.strokes), 4)
+        self.assertTrue(canvas.undo())
+        self.assertEqual(len(canvas.strokes), 3)
+
+    def test_undo_repaints_once(self):
+        from stroke_buffer import Stroke
+
+        canvas = self._canvas()
+        strokes = [Stroke(array('f', [5, 5 + 4 * i, 60, 5 + 4 * i]), (1, 0, 0, 1), 2)
+                   for i in range(10)]
+        for stroke in strokes:
+            canvas.add_stroke(stroke)
+        for stroke in strokes[:6]:
+            canvas.erase_strokes([stroke])
+
+        layers = []
+        new_layer = canvas._new_layer
+        canvas._new_layer = lambda: (layers.append(1), new_layer())
+        self.assertTrue(canvas.undo())
+        # Se vuelve al estado inicial y se pinta al final, no en cada borrado
+        self.assertLessEqual(len(layers), 2)
+        self.assertEqual(canvas.strokes, strokes[5:])
+
+        pixels = canvas._fbo.pixels
+        new_layer()
+        canvas._bake(canvas.strokes)
+        self.assertEqual(canvas._fbo.pixels, pixels)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+'''
+SegmentGrid de spatial_index.py: consultas, cajas, borrado y el alargado
+del último segmento mientras se dibuja (replace_last).
+
+    python -m pytest test_spatial_index.py
+'''
+
+import random
+import unittest
+
+from spatial_index import SegmentGrid, segment_distance2
+
+
+def brute_force(strokes, x, y, radius):
+    """Claves a menos de ``radius`` de (x, y) mirando todos los segmentos."""
+    found = set()
+    for key, (points, r) in strokes.items():
+        reach = (radius + r) ** 2
+        pairs = [(points[i], points[i + 1]) for i in range(0, len(points), 2)]
+        if len(pairs) == 1:
+            pairs *= 2
+        for (x1, y1), (x2, y2) in zip(pairs, pairs[1:]):
+            if segment_distance2(x, y, x1, y1, x2, y2) <= reach:
+                found.add(key)
+                break
+    return found
+
+
+class SegmentGridTest(unittest.TestCase):
+
+    def test_segment_distance(self):
+        self.assertEqual(segment_distance2(0, 5, -10, 0, 10, 0), 25)
+        # Más allá de los extremos cuenta la distancia al extremo
+        self.assertEqual(segment_distance2(13, 4, -10, 0, 10, 0), 25)
+        # Segmento degenerado (un punto)
+        self.assertEqual(segment_distance2(3, 4, 0, 0, 0, 0), 25)
+
+    def test_query_uses_stroke_width(self):
+        grid = SegmentGrid()
+        grid.add_points('a', [0, 0, 100, 0], radius=2)
+        self.assertEqual(grid.query(50, 5, 3), {'a'})
+        self.assertEqual(grid.query(50, 5.5, 3), set())
+        self.assertEqual(grid.query(-4, -1, 3), {'a'})
+
+    def test_single_point_stroke(self):
+        grid = SegmentGrid()
+        grid.add_points('dot', [-40, -40], radius=1)
+        self.assertEqual(grid.query(-42, -40, 1), {'dot'})
+        self.assertEqual(grid.bbox('dot'), (-41, -41, -39, -39))
+
+    def test_bbox_grows_with_segments(self):
+        grid = SegmentGrid()
+        grid.add_segment('a', 0, 0, 10, 10, 1)
+        grid.add_segment('a', 10, 10, 30, -5, 1)
+        self.assertEqual(grid.bbox('a'), (-1, -6, 31, 11))
+        self.assertEqual(len(grid), 1)
+        self.assertEqual(grid.segments, 2)
+
+    def test_remove(self):
+        grid = SegmentGrid(cell_size=8)
+        grid.add_points('a', [0, 0, 50, 50, 100, 0])
+        grid.add_points('b', [0, 10, 100, 10])
+        grid.remove('a')
+        grid.remove('missing')
+        self.assertNotIn('a', grid)
+        self.assertEqual(grid.query(50, 50, 1), set())
+        self.assertEqual(grid.query(50, 10, 1), {'b'})
+        self.assertEqual(grid.segments, 1)
+        grid.remove('b')
+        self.assertEqual(grid._cells, {})
+
+    def test_matches_brute_force(self):
+        rng = random.Random(1)
+        grid = SegmentGrid(cell_size=16)
+        strokes = {}
+        for key in range(40):
+            points = [rng.uniform(-200, 200) for _ in range(2 * rng.randint(1, 8))]
+            strokes[key] = (points, rng.uniform(0, 3))
+            grid.add_points(key, points, strokes[key][1])
+        for _ in range(300):
+            x, y, r = rng.uniform(-220, 220), rng.uniform(-220, 220), rng.uniform(0, 20)
+            self.assertEqual(grid.query(x, y, r), brute_force(strokes, x, y, r))
+
+
+class ReplaceLastTest(unittest.TestCase):
+
+    def test_straight_run_keeps_one_segment(self):
+        grid = SegmentGrid(cell_size=8)
+        grid.add_points('a', [0, 0])
+        grid.add_segment('a', 0, 0, 1, 0)
+        cells = len(grid._cells)
+        for x in range(2, 1000):
+            grid.replace_last('a', x, 0)
+        self.assertEqual(grid.segments, 2)
+        self.assertEqual(grid.query(999, 0), {'a'})
+        self.assertEqual(grid.bbox('a'), (0, 0, 999, 0))
+        # Cada celda guarda el segmento una sola vez
+        self.assertEqual(sum(len(bucket) for bucket in grid._cells.values()),
+                         len(grid._cells) + cells)
+
+    def test_matches_rebuilt_index(self):
+        rng = random.Random(3)
+        for _ in range(100):
+            grid = SegmentGrid(cell_size=8)
+            points = [rng.uniform(-50, 50), rng.uniform(-50, 50)]
+            grid.add_points('a', points, 1)
+            for _ in range(30):
+                x, y = rng.uniform(-80, 80), rng.uniform(-80, 80)
+                if len(points) >= 4 and rng.random() < 0.6:
+                    points[-2:] = [x, y]
+                    grid.replace_last('a', x, y)
+                else:
+                    points += [x, y]
+                    grid.add_segment('a', points[-4], points[-3], x, y, 1)
+
+            strokes = {'a': (points, 1)}
+            for _ in range(50):
+                x, y, r = rng.uniform(-90, 90), rng.uniform(-90, 90), rng.uniform(0, 10)
+                self.assertEqual(grid.query(x, y, r), brute_force(strokes, x, y, r))
+            grid.remove('a')
+            self.assertEqual(grid._cells, {})
+            self.assertEqual(grid.segments, 0)
+
+    def test_shrinking_segment_leaves_cells(self):
+        grid = SegmentGrid(cell_size=8)
+        grid.add_segment('a', 0, 0, 100, 100)
+        grid.replace_last('a', 4, 4)
+        self.assertEqual(grid.query(90, 90, 1), set())
+        self.assertEqual(list(grid._cells), [(0, 0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
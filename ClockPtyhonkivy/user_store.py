@@ -0,0 +1,106 @@
+'''
+Local user store for Login.py.
+
+Users live in a SQLite database with a unique index on the username.
+Passwords are never stored: only a salt, the KDF parameters and the
+derived key. The KDF is scrypt (memory-hard) when the Python build has it,
+otherwise PBKDF2-HMAC-SHA256. Both are deliberately slow, so callers in a
+UI should run hash_password()/verify_password() off the main thread.
+'''
+
+import hashlib
+import hmac
+import os
+import sqlite3
+
+# scrypt parameters: 16 MiB of memory per hash
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+# PBKDF2 fallback iterations
+PBKDF2_ITERATIONS = 600000
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+
+class UserExistsError(ValueError):
+    """The username is already registered."""
+
+
+def default_kdf():
+    """KDF spec used for new passwords."""
+    if hasattr(hashlib, 'scrypt'):
+        return f'scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}'
+    return f'pbkdf2_sha256${PBKDF2_ITERATIONS}'
+
+
+def derive_key(password, salt, kdf):
+    """Derive the key for ``password`` with the given salt and KDF spec."""
+    name, *params = kdf.split('$')
+    secret = password.encode('utf-8')
+    if name == 'scrypt':
+        n, r, p = (int(v) for v in params)
+        return hashlib.scrypt(secret, salt=salt, n=n, r=r, p=p,
+                              maxmem=2 * 128 * n * r * p, dklen=KEY_BYTES)
+    if name == 'pbkdf2_sha256':
+        return hashlib.pbkdf2_hmac('sha256', secret, salt, int(params[0]), KEY_BYTES)
+    raise ValueError(f'unknown KDF {name!r}')
+
+
+def hash_password(password, kdf=None):
+    """Return (kdf, salt, key) for a new password. Slow on purpose."""
+    kdf = kdf or default_kdf()
+    salt = os.urandom(SALT_BYTES)
+    return kdf, salt, derive_key(password, salt, kdf)
+
+
+def verify_password(password, record):
+    """
+    Check ``password`` against a (kdf, salt, key) record. Slow on purpose.
+
+    An unknown user (``record`` None) still pays for one key derivation, so
+    the response time does not reveal which usernames exist.
+    """
+    if record is None:
+        hash_password(password)
+        return False
+    kdf, salt, key = record
+    return hmac.compare_digest(derive_key(password, salt, kdf), key)
+
+
+class UserStore:
+    """SQLite table of users: username, KDF spec, salt and derived key."""
+
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS users ('
+                         ' id INTEGER PRIMARY KEY,'
+                         ' username TEXT NOT NULL,'
+                         ' kdf TEXT NOT NULL,'
+                         ' salt BLOB NOT NULL,'
+                         ' key BLOB NOT NULL)')
+        self._db.execute('CREATE UNIQUE INDEX IF NOT EXISTS users_username ON users (username)')
+        self._db.commit()
+
+    def close(self):
+        self._db.close()
+
+    def exists(self, username):
+        row = self._db.execute('SELECT 1 FROM users WHERE username = ?', (username,)).fetchone()
+        return row is not None
+
+    def record(self, username):
+        """(kdf, salt, key) of a user, or None if it does not exist."""
+        return self._db.execute('SELECT kdf, salt, key FROM users WHERE username = ?',
+                                (username,)).fetchone()
+
+    def add(self, username, record):
+        """Store a user with a record from hash_password()."""
+        kdf, salt, key = record
+        try:
+            with self._db:
+                self._db.execute('INSERT INTO users (username, kdf, salt, key) VALUES (?, ?, ?, ?)',
+                                 (username, kdf, salt, key))
+        except sqlite3.IntegrityError:
+            raise UserExistsError(username) from None